@@ -4,33 +4,26 @@ Advanced Jobindex Scraper
 Scrapes job postings from Jobindex.dk with better selectors and fallback options
 """
 
-import requests
 import json
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-import time
 import re
 import random
 
+from http_transport import shared_session
+from rate_limiter import paced_get, shared_limiter
+
 
 class AdvancedJobindexScraper:
     def __init__(self):
         """Initialize the scraper"""
         self.base_url = "https://www.jobindex.dk"
         self.jobs = []
-        self.session = requests.Session()
-        
-        # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0',
-        })
+        # Shared pooled session with retries, circuit breaker and default headers
+        self.session = shared_session()
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
     
     def scrape_jobs(self, num_jobs=10, search_term="", location=""):
         """
@@ -67,7 +60,7 @@ class AdvancedJobindexScraper:
                         params['location'] = location
                     
                     # Make the request
-                    response = self.session.get(search_url, params=params, timeout=10)
+                    response = paced_get(self.session, search_url, self.limiter, params=params, timeout=10)
                     response.raise_for_status()
                     
                     # Parse the HTML
@@ -88,8 +81,6 @@ class AdvancedJobindexScraper:
                             jobs_scraped += 1
                             print(f"Scraped job {jobs_scraped}: {job.get('title', 'Unknown')}")
                     
-                    time.sleep(1)  # Be respectful
-                    
                 except Exception as e:
                     print(f"Error scraping from {search_url}: {e}")
                     continue
@@ -112,7 +103,7 @@ class AdvancedJobindexScraper:
                         break
                     
                     try:
-                        response = self.session.get(category_url, timeout=10)
+                        response = paced_get(self.session, category_url, self.limiter, timeout=10)
                         response.raise_for_status()
                         soup = BeautifulSoup(response.content, 'html.parser')
                         
@@ -129,8 +120,6 @@ class AdvancedJobindexScraper:
                                 jobs_scraped += 1
                                 print(f"Scraped job {jobs_scraped}: {job.get('title', 'Unknown')}")
                         
-                        time.sleep(1)
-                        
                     except Exception as e:
                         print(f"Error scraping from category {category_url}: {e}")
                         continue
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Async Jobindex Scraper
+Runs the Jobindex scrapers' page parsing on top of a shared asyncio HTTP
+client, so many search pages and detail pages can be in flight at once
+"""
+
+import asyncio
+import time
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from final_jobindex_scraper import FinalJobindexScraper
+from rate_limiter import AdaptiveRateLimiter
+
+
+class AsyncJobindexScraper:
+    def __init__(self, scraper_class=FinalJobindexScraper, max_concurrency=50,
+                 connections_per_host=20, requests_per_second=10.0, search_paths=("/jobsoegning", "/job")):
+        """
+        Initialize the async engine
+
+        Args:
+            scraper_class: Blocking scraper whose parsing and save_to_* methods are reused
+                (FinalJobindexScraper, RealJobindexScraper, RobustJobindexScraper,
+                AdvancedJobindexScraper or SimpleJobindexScraper)
+            max_concurrency (int): Requests in flight across all hosts
+            connections_per_host (int): Size of the shared connection pool per host
+            requests_per_second (float): Starting request rate per host; adapts to responses
+            search_paths (tuple): Search pages queried for each term
+        """
+        self.parser = scraper_class()
+        self.base_url = self.parser.base_url
+        self.jobs = self.parser.jobs
+        self.headers = dict(self.parser.session.headers)
+        self.max_concurrency = max_concurrency
+        self.connections_per_host = connections_per_host
+        self.search_paths = search_paths
+        self.limiter = AdaptiveRateLimiter(requests_per_second, max_rate=max(10.0, requests_per_second * 4))
+        self._seen_keys = set()
+        self._http = None
+        self._semaphore = None
+
+    async def _open(self):
+        """Create the shared client session and concurrency limit inside the running loop"""
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.connections_per_host)
+        self._http = aiohttp.ClientSession(headers=self.headers, connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _close(self):
+        """Close the shared client session"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    def _run(self, coro_factory):
+        """Run a coroutine with the shared session open, from blocking code"""
+        async def runner():
+            await self._open()
+            try:
+                return await coro_factory()
+            finally:
+                await self._close()
+        return asyncio.run(runner())
+
+    async def _get(self, url, params=None, timeout=15):
+        """GET a URL under the concurrency and per-host rate limits; returns (status, body)"""
+        async with self._semaphore:
+            await asyncio.sleep(self.limiter.reserve(url))
+            started = time.perf_counter()
+            try:
+                async with self._http.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.limiter.record(url, error=True, latency=time.perf_counter() - started)
+                raise
+            retry_after = response.headers.get('Retry-After')
+            self.limiter.record(url, response.status, time.perf_counter() - started,
+                                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+            return response.status, body
+
+    def _parse_search_page(self, content, max_jobs):
+        """
+        Parse a search page with whichever extraction the wrapped scraper provides
+
+        Returns (jobs, searchResponse or None); only scrapers that decode the
+        Stash data (FinalJobindexScraper) return the searchResponse that
+        pagination needs, so the others stop after the first page.
+        """
+        if hasattr(self.parser, '_parse_search_page'):
+            # Decodes the Stash data from the raw bytes and only parses HTML as a fallback
+            return self.parser._parse_search_page(content, max_jobs)
+        soup = BeautifulSoup(content, 'html.parser')
+        if hasattr(self.parser, '_extract_jobs_from_json'):
+            return self.parser._extract_jobs_from_json(soup, max_jobs), None
+        if hasattr(self.parser, '_extract_jobs_from_page'):
+            return self.parser._extract_jobs_from_page(soup, max_jobs), None
+        jobs = []
+        for card in self.parser._extract_jobs_from_page_structure(soup)[:max_jobs]:
+            job = self.parser._extract_job_data(card)
+            if job and job.get('title'):
+                jobs.append(job)
+        return jobs, None
+
+    def _add_job(self, job):
+        """Append a job unless it was already collected; keyed on TID, else title and company"""
+        key = job.get('tid') or (job.get('title'), job.get('company'))
+        if key in self._seen_keys:
+            return False
+        self._seen_keys.add(key)
+        self.jobs.append(job)
+        if getattr(self.parser, 'sink', None):
+            self.parser.sink.write(job)
+        return True
+
+    async def scrape_jobs_async(self, num_jobs=10, search_term="", location="", max_pages=None):
+        """
+        Collect up to num_jobs new jobs for one term
+
+        The first page of every search path is fetched concurrently. Where it
+        carries a searchResponse, later pages follow from its hitcount and
+        page_size, fetched concurrently in batches of as many pages as the
+        remaining jobs need. A path stops on an empty page, and later paths
+        are skipped once the term's hitcount is covered.
+        """
+        params = {}
+        if search_term:
+            params['q'] = search_term
+        if location:
+            params['location'] = location
+
+        urls = [f"{self.base_url}{path}" for path in self.search_paths]
+        responses = await asyncio.gather(
+            *(self._get(url, params=params) for url in urls), return_exceptions=True
+        )
+
+        jobs_scraped = 0
+        # Every key the term returned, new or duplicate, to tell when the hitcount is covered
+        term_keys = set()
+        hitcount = None
+        for url, response in zip(urls, responses):
+            if jobs_scraped >= num_jobs or (hitcount is not None and len(term_keys) >= hitcount):
+                break
+            content = self._page_content(url, 1, response)
+            if content is None:
+                continue
+
+            page_jobs, search_response = await self._parse_in_executor(content, num_jobs - jobs_scraped)
+            jobs_scraped = self._add_page_jobs(page_jobs, num_jobs, jobs_scraped, term_keys)
+            if not search_response:
+                continue
+
+            hitcount = search_response.get('hitcount') or 0
+            page_size = search_response.get('page_size') or len(search_response.get('results', [])) or 1
+            total_pages = -(-hitcount // page_size)
+            if max_pages:
+                total_pages = min(total_pages, max_pages)
+
+            next_page = 2
+            while next_page <= total_pages and jobs_scraped < num_jobs and len(term_keys) < hitcount:
+                batch = range(next_page, min(total_pages, next_page - 1 + -(-(num_jobs - jobs_scraped) // page_size)) + 1)
+                next_page = batch[-1] + 1
+                page_responses = await asyncio.gather(
+                    *(self._get(url, params=dict(params, page=page)) for page in batch), return_exceptions=True
+                )
+                for page, page_response in zip(batch, page_responses):
+                    content = self._page_content(url, page, page_response)
+                    if content is None:
+                        continue
+                    page_jobs, _ = await self._parse_in_executor(content, num_jobs - jobs_scraped)
+                    if not page_jobs:
+                        print(f"No results on page {page} of {url}; stopping")
+                        next_page = total_pages + 1
+                        break
+                    jobs_scraped = self._add_page_jobs(page_jobs, num_jobs, jobs_scraped, term_keys)
+
+        print(f"Scraped {jobs_scraped} new jobs for '{search_term}'")
+        return jobs_scraped
+
+    def _page_content(self, url, page, response):
+        """Body of a gathered search page response, or None after reporting why not"""
+        if isinstance(response, Exception):
+            print(f"Error scraping page {page} of {url}: {response}")
+            return None
+        status, content = response
+        if status != 200:
+            print(f"Error scraping page {page} of {url}: HTTP {status}")
+            return None
+        return content
+
+    async def _parse_in_executor(self, content, max_jobs):
+        # Parsing is CPU-bound; keep it off the event loop so other requests progress
+        return await asyncio.get_running_loop().run_in_executor(None, self._parse_search_page, content, max_jobs)
+
+    def _add_page_jobs(self, page_jobs, num_jobs, jobs_scraped, term_keys):
+        """Add a page's jobs up to num_jobs; returns the new jobs_scraped"""
+        for job in page_jobs:
+            if jobs_scraped >= num_jobs:
+                break
+            term_keys.add(job.get('tid') or (job.get('title'), job.get('company')))
+            if self._add_job(job):
+                jobs_scraped += 1
+        return jobs_scraped
+
+    async def scrape_terms_async(self, search_terms, num_jobs=200, location=""):
+        """Scrape several search terms concurrently over the shared session"""
+        counts = await asyncio.gather(
+            *(self.scrape_jobs_async(num_jobs, term, location) for term in search_terms)
+        )
+        return dict(zip(search_terms, counts))
+
+    async def fetch_job_details_async(self, job_urls):
+        """Fetch detail pages concurrently; returns per-URL dicts in input order, like fetch_job_details_concurrently"""
+        loop = asyncio.get_running_loop()
+
+        async def fetch(job_url):
+            started = time.perf_counter()
+            result = {'url': job_url, 'contact_email': "", 'status': None, 'elapsed': 0.0, 'error': None}
+            try:
+                status, content = await self._get(job_url, timeout=10)
+                result['status'] = status
+                if status == 200 and hasattr(self.parser, '_extract_contact_email_from_detail_page'):
+                    result['contact_email'] = await loop.run_in_executor(
+                        None, self.parser._extract_contact_email_from_detail_page, content
+                    )
+            except Exception as e:
+                print(f"Error fetching job details: {e}")
+                result['error'] = str(e)
+            result['elapsed'] = time.perf_counter() - started
+            return result
+
+        return await asyncio.gather(*(fetch(url) for url in job_urls))
+
+    def scrape_jobs(self, num_jobs=10, search_term="", location=""):
+        """
+        Scrape job postings from Jobindex
+
+        Args:
+            num_jobs (int): Number of jobs to scrape
+            search_term (str): Job search term
+            location (str): Location to search in
+        """
+        return self._run(lambda: self.scrape_jobs_async(num_jobs, search_term, location))
+
+    def scrape_terms(self, search_terms, num_jobs=200, location=""):
+        """Scrape several search terms concurrently; returns new jobs per term"""
+        return self._run(lambda: self.scrape_terms_async(search_terms, num_jobs, location))
+
+    def fetch_job_details(self, job_urls):
+        """Fetch detail pages concurrently from blocking code"""
+        return self._run(lambda: self.fetch_job_details_async(job_urls))
+
+    def save_to_json(self, *args, **kwargs):
+        """Save scraped jobs to JSON file using the wrapped scraper's format"""
+        self.parser.save_to_json(*args, **kwargs)
+
+    def save_to_csv(self, *args, **kwargs):
+        """Save scraped jobs to CSV file using the wrapped scraper's format"""
+        self.parser.save_to_csv(*args, **kwargs)
+
+    def print_summary(self):
+        """Print a summary of scraped jobs"""
+        self.parser.print_summary()
+
+
+def main():
+    """Main function to run the async scraper"""
+    print("Starting Async Jobindex Scraper...")
+
+    scraper = AsyncJobindexScraper()
+
+    data_terms = ["data", "data analyst", "data scientist", "data engineer", "data science", "data analytics", "data processing", "data management", "data visualization", "data mining", "data warehouse", "dataanalytiker", "datascientist", "dataengineer"]
+
+    started = time.perf_counter()
+    counts = scraper.scrape_terms(data_terms, num_jobs=200)
+    print(f"Scraped {len(scraper.jobs)} unique jobs for {len(counts)} terms in {time.perf_counter() - started:.1f}s")
+
+    scraper.save_to_json("async_jobindex_jobs.json")
+    scraper.save_to_csv("async_jobindex_jobs.csv")
+    scraper.print_summary()
+
+
+if __name__ == "__main__":
+    main()
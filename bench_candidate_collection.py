@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Candidate Collection Benchmark
+Compares the robust scraper's original candidate-element collection (11 CSS
+selectors, four text walks and list membership checks) with the single-pass
+JobCandidates collector on saved pages and on a large generated listing page,
+and checks every element the original found is still a candidate (page-level
+elements such as body, title and script excepted)
+
+Usage: python3 bench_candidate_collection.py [page.html ...]
+(defaults to the debug_page_*.html files in this directory)
+"""
+
+import glob
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from job_candidates import PAGE_TAGS, JobCandidates
+
+
+def legacy_candidates(soup):
+    """The original collection from _extract_jobs_from_page, without the printing"""
+    potential_job_elements = []
+    job_selectors = [
+        '[class*="job"]', '[class*="stilling"]', '[class*="position"]',
+        '[class*="listing"]', '[class*="card"]', '[class*="item"]',
+        '[data-testid*="job"]', '[data-testid*="listing"]',
+        'article', '.result', '.search-result'
+    ]
+    for selector in job_selectors:
+        potential_job_elements.extend(soup.select(selector))
+
+    soup.find_all('a', href=re.compile(r'/job/|/stilling/|/position/|/vacancy/'))
+
+    job_text_patterns = [
+        r'\b(job|stilling|position|vacancy|ansættelse)\b',
+        r'\b(software|developer|engineer|analyst|manager)\b',
+        r'\b(fuldtid|deltid|kontrakt|freelance)\b',
+        r'\d+\.?\d*\s*(kr|dkk|kroner)',
+    ]
+    for pattern in job_text_patterns:
+        for element in soup.find_all(string=re.compile(pattern, re.IGNORECASE)):
+            if element.parent and element.parent not in potential_job_elements:
+                potential_job_elements.append(element.parent)
+
+    unique_elements = []
+    seen = set()
+    for element in potential_job_elements:
+        if id(element) not in seen:
+            seen.add(id(element))
+            unique_elements.append(element)
+    return unique_elements
+
+
+def large_page(cards):
+    """A listing page with many job cards, each a handful of nested elements"""
+    card = (
+        '<div class="jobsearch-result card"><h4><a href="/job/{i}">Data Analyst {i}</a></h4>'
+        '<div class="company">Firma {i} ApS</div><p>Fuldtid i København, 42.000 kr pr. måned. '
+        'Vi søger en software developer til vores team.</p><ul><li>SQL</li><li>Python</li></ul></div>'
+    )
+    return '<html><body><main>' + ''.join(card.format(i=i) for i in range(cards)) + '</main></body></html>'
+
+
+def time_it(func, soup, rounds):
+    """Best-of-rounds wall time for one call"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(soup)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Run the benchmark"""
+    paths = sys.argv[1:] or sorted(glob.glob("debug_page_*.html"))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+    pages.append(("Generated page, 1000 job cards", large_page(1000)))
+
+    for name, content in pages:
+        soup = BeautifulSoup(content, 'html.parser')
+        legacy = {id(element) for element in legacy_candidates(soup) if element.name not in PAGE_TAGS}
+        candidates = JobCandidates(soup)
+        collected = set(candidates.scores)
+        print(f"📄 {name}: {sum(1 for _ in soup.descendants)} nodes")
+        print(f"{'✅' if legacy <= collected else '❌'} {len(collected)} candidates, "
+              f"{len(legacy - collected)} of the original {len(legacy)} missing")
+
+        rounds = 1 if len(content) > 200000 else 3
+        legacy_time = time_it(legacy_candidates, soup, rounds)
+        indexed_time = time_it(lambda s: JobCandidates(s).top(20), soup, rounds)
+        print(f"Selectors + text walks: {legacy_time * 1000:10.2f} ms")
+        print(f"Single pass, top 20:    {indexed_time * 1000:10.2f} ms ({legacy_time / max(indexed_time, 1e-9):.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
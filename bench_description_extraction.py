@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Description Extraction Benchmark
+Compares the original parse-everything-then-truncate description extraction
+with the streaming extractor on the search results in saved pages, plus the
+same results padded to large postings, and checks both return the same text
+
+Usage: python3 bench_description_extraction.py [page.html ...]
+(defaults to the debug_page_*.html files in this directory)
+"""
+
+import glob
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from description_extractor import extract_description
+from final_jobindex_scraper import FinalJobindexScraper
+
+
+def legacy_description(html_content):
+    """The original extraction: full parse, decompose script/style, normalize all text, truncate"""
+    if not html_content:
+        return ""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    if len(text) > 500:
+        text = text[:500] + "..."
+    return text
+
+
+def time_it(func, htmls, rounds):
+    """Best-of-rounds wall time for running func over every fragment"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for html_content in htmls:
+            func(html_content)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Run the benchmark"""
+    paths = sys.argv[1:] or sorted(glob.glob("debug_page_*.html"))
+    scraper = FinalJobindexScraper()
+    htmls = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            search_response = scraper._extract_search_response_from_bytes(f.read())
+        if search_response:
+            htmls += [result.get('html', '') for result in search_response['results']]
+    if not htmls:
+        print("❌ No search results to benchmark")
+        return
+
+    # Long postings: each result followed by a large inline script and a long body
+    body = "<p>Vi søger en erfaren medarbejder til vores team.  Du får ansvar for drift og udvikling.</p>\n" * 2000
+    large = [html_content + "<script>var data = '" + "x" * 50000 + "';</script>" + body for html_content in htmls]
+
+    for name, corpus in (("Search results", htmls), ("Large postings", large)):
+        mismatches = [i for i, html_content in enumerate(corpus)
+                      if legacy_description(html_content) != extract_description(html_content)]
+        print(f"📄 {name}: {len(corpus)} fragments, {sum(len(h) for h in corpus) / 1024:.0f} KB of HTML")
+        print(f"{'✅' if not mismatches else '❌'} Results identical on {len(corpus) - len(mismatches)}/{len(corpus)} fragments")
+
+        rounds = 5
+        legacy = time_it(legacy_description, corpus, rounds)
+        streaming = time_it(extract_description, corpus, rounds)
+        print(f"BeautifulSoup + truncate: {legacy * 1000:8.2f} ms")
+        print(f"Streaming, capped:        {streaming * 1000:8.2f} ms ({legacy / max(streaming, 1e-9):.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
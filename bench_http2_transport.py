@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+HTTP/2 Transport Benchmark
+Fetches the same batch of pages concurrently through the pooled HTTP/1.1
+session and the multiplexed HTTP/2 session, against local TLS test servers
+that simulate a round-trip time, and reports wall time and connections opened
+
+Needs httpx[http2] (which brings in h2, used for the HTTP/2 test server) and
+the openssl command line tool for the self-signed certificate.
+
+Usage: python3 bench_http2_transport.py [requests] [workers] [rtt_ms]
+(defaults to 200 requests, 8 workers and a 30 ms round trip)
+"""
+
+import asyncio
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_transport import Http2Session, create_session, http2_available
+from rate_limiter import paced_get
+
+
+# A detail-page sized body
+PAYLOAD = b"<html><body>" + b"<p>Vi s\xc3\xb8ger en dataanalytiker til vores team.</p>" * 400 + b"</body></html>"
+
+
+def make_certificate(directory):
+    """Self-signed certificate for localhost; returns (cert_path, key_path)"""
+    cert_path = os.path.join(directory, 'cert.pem')
+    key_path = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-keyout', key_path, '-out', cert_path, '-subj', '/CN=localhost',
+         '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'],
+        check=True, capture_output=True,
+    )
+    return cert_path, key_path
+
+
+def server_context(cert_path, key_path, protocol):
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    context.set_alpn_protocols([protocol])
+    return context
+
+
+class Http1Server(ThreadingHTTPServer):
+    """Keep-alive HTTP/1.1 over TLS; each new connection costs two extra round trips (TCP + TLS handshakes)"""
+    daemon_threads = True
+
+    def __init__(self, context, rtt):
+        self.context = context
+        self.rtt = rtt
+        self.connections = 0
+        super().__init__(('127.0.0.1', 0), Http1Handler)
+
+    def process_request_thread(self, request, client_address):
+        self.connections += 1
+        try:
+            request = self.context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.shutdown_request(request)
+            return
+        time.sleep(2 * self.rtt)
+        super().process_request_thread(request, client_address)
+
+
+class Http1Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(self.server.rtt)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Http2Server:
+    def __init__(self, context, rtt):
+        """HTTP/2 over TLS on an asyncio loop in a background thread, with the same simulated round trips"""
+        self.context = context
+        self.rtt = rtt
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self._serve, '127.0.0.1', 0, ssl=self.context)
+        )
+        self.server_address = self.server.sockets[0].getsockname()
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _serve(self, reader, writer):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        self.connections += 1
+        await asyncio.sleep(2 * self.rtt)
+        connection = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+        window_open = asyncio.Event()
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.rtt)
+            connection.send_headers(stream_id, [
+                (':status', '200'), ('content-type', 'text/html; charset=utf-8'),
+                ('content-length', str(len(PAYLOAD))),
+            ])
+            data = PAYLOAD
+            while data:
+                # Respect flow control: wait for WINDOW_UPDATE when the window is used up
+                size = min(connection.local_flow_control_window(stream_id), connection.max_outbound_frame_size, len(data))
+                if size <= 0:
+                    window_open.clear()
+                    await window_open.wait()
+                    continue
+                connection.send_data(stream_id, data[:size], end_stream=size == len(data))
+                data = data[size:]
+                writer.write(connection.data_to_send())
+            writer.write(connection.data_to_send())
+
+        tasks = set()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.ensure_future(respond(event.stream_id))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        window_open.set()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(connection.data_to_send())
+        except (ConnectionError, ssl.SSLError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    def shutdown(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def fetch_all(session, urls, workers):
+    """Wall time for fetching every URL on a thread pool, as fetch_job_details_concurrently does"""
+    def fetch(url):
+        response = paced_get(session, url, None, timeout=30)
+        if response.status_code != 200 or response.content != PAYLOAD:
+            raise RuntimeError(f"Bad response for {url}: {response.status_code}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(fetch, urls))
+    return time.perf_counter() - started
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rtt = (float(sys.argv[3]) if len(sys.argv) > 3 else 30.0) / 1000
+
+    if not http2_available():
+        print("❌ httpx with HTTP/2 support is not installed: pip install 'httpx[http2]'")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = make_certificate(directory)
+        http1_server = Http1Server(server_context(cert_path, key_path, 'http/1.1'), rtt)
+        threading.Thread(target=http1_server.serve_forever, daemon=True).start()
+        http2_server = Http2Server(server_context(cert_path, key_path, 'h2'), rtt)
+
+        print(f"📄 {count} requests, {workers} workers, {rtt * 1000:.0f} ms simulated round trip, "
+              f"{len(PAYLOAD) / 1024:.0f} KB per response")
+
+        session = create_session()
+        session.verify = cert_path
+        # Otherwise REQUESTS_CA_BUNDLE or proxy settings from the environment take precedence
+        session.trust_env = False
+        port = http1_server.server_address[1]
+        http1 = fetch_all(session, [f"https://localhost:{port}/job/{i}" for i in range(count)], workers)
+        session.close()
+
+        session = Http2Session(verify=ssl.create_default_context(cafile=cert_path))
+        port = http2_server.server_address[1]
+        http2 = fetch_all(session, [f"https://localhost:{port}/job/{i}" for i in range(count)], workers)
+        session.close()
+
+        print(f"HTTP/1.1, pooled:      {http1 * 1000:8.1f} ms, {http1_server.connections} connections")
+        print(f"HTTP/2, multiplexed:   {http2 * 1000:8.1f} ms, {http2_server.connections} connections "
+              f"({http1 / max(http2, 1e-9):.1f}x faster)")
+
+        http1_server.shutdown()
+        http2_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
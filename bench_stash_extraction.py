@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Stash Extraction Benchmark
+Compares locating the search results with a full BeautifulSoup parse plus the
+old non-greedy regex against decoding the Stash object from the raw bytes
+
+Usage: python3 bench_stash_extraction.py [page.html]
+(defaults to debug_page_0.html)
+"""
+
+import json
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from final_jobindex_scraper import FinalJobindexScraper
+
+
+def legacy_search_response(content):
+    """The original lookup: parse the whole page, find the Stash script, regex out the object"""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup.find_all('script'):
+        if script.string and 'Stash' in script.string:
+            stash_match = re.search(r'var Stash = ({.*?});', script.string, re.DOTALL)
+            if stash_match:
+                try:
+                    stash_data = json.loads(stash_match.group(1))
+                except ValueError:
+                    # The non-greedy match stopped at a nested '};'
+                    continue
+                job_data = stash_data.get('jobsearch/result_app', {})
+                search_response = job_data.get('storeData', {}).get('searchResponse')
+                if search_response and 'results' in search_response:
+                    return search_response
+    return None
+
+
+def best_time(func, content, rounds):
+    """Best-of-rounds wall time for one call"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Run the benchmark"""
+    path = sys.argv[1] if len(sys.argv) > 1 else "debug_page_0.html"
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    scraper = FinalJobindexScraper()
+    fast = scraper._extract_search_response_from_bytes(content)
+    legacy = legacy_search_response(content)
+
+    print(f"📄 {path}: {len(content) / 1024:.0f} KB")
+    if fast is None:
+        print("❌ Fast path found no searchResponse")
+        return
+    print(f"Fast path: {len(fast['results'])} results, hitcount {fast.get('hitcount')}")
+    if legacy is None:
+        print("⚠️ Legacy regex path found no searchResponse on this page")
+    else:
+        print(f"{'✅' if legacy == fast else '❌'} Legacy and fast path agree")
+
+    rounds = 10
+    legacy_time = best_time(legacy_search_response, content, rounds)
+    fast_time = best_time(scraper._extract_search_response_from_bytes, content, rounds)
+    print(f"BeautifulSoup + regex:  {legacy_time * 1000:8.2f} ms")
+    print(f"Raw bytes + raw_decode: {fast_time * 1000:8.2f} ms ({legacy_time / max(fast_time, 1e-9):.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
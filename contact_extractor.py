@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Contact Extractor
+Precompiled email extraction shared by the Jobindex scrapers
+"""
+
+import re
+
+
+# Email sub-expression shared by every contact pattern in the scrapers
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+EMAIL_RE = re.compile(EMAIL_PATTERN, re.IGNORECASE)
+
+# The scrapers' first (word-bounded) email pattern, which takes priority over everything else
+BOUNDED_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+
+# Labelled detail-page patterns, in the order FinalJobindexScraper has always tried them.
+# Only reached when BOUNDED_EMAIL_RE finds nothing but EMAIL_RE does (e.g. "a@b.dk2").
+DETAIL_PAGE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        rf'(email|e-mail|mail):\s*({EMAIL_PATTERN})',
+        rf'(kontakt|contact):\s*({EMAIL_PATTERN})',
+        rf'(ansøg|apply|application):\s*({EMAIL_PATTERN})',
+        rf'(hr|personal|recruitment):\s*({EMAIL_PATTERN})',
+        rf'(send|email|mail)\s+til\s+({EMAIL_PATTERN})',
+        rf'(kontakt|contact)\s+os\s+på\s+({EMAIL_PATTERN})',
+        rf'(spørgsmål|questions):\s*({EMAIL_PATTERN})',
+        rf'(yderligere|further)\s+information:\s*({EMAIL_PATTERN})',
+        rf'(for\s+mere\s+info|for\s+more\s+info):\s*({EMAIL_PATTERN})',
+        rf'(ansøgningsfrist|deadline):\s*({EMAIL_PATTERN})',
+        rf'(søg\s+jobbet|apply\s+for\s+position):\s*({EMAIL_PATTERN})',
+        rf'(kontaktperson|contact person|ansøgningsansvarlig):\s*({EMAIL_PATTERN})',
+        rf'(manager|leder|chef):\s*({EMAIL_PATTERN})',
+        rf'(ansøg til|apply to|send ansøgning til):\s*({EMAIL_PATTERN})',
+        rf'(jobansøgning|job application):\s*({EMAIL_PATTERN})',
+    ]
+]
+
+# Context labels and the keywords that select them, checked in order against the
+# text just before an email
+CONTEXT_KEYWORDS = [
+    ('kontakt', re.compile(r'kontakt|contact', re.IGNORECASE)),
+    ('ansøg', re.compile(r'ansøg|apply|application|søg\s+jobbet', re.IGNORECASE)),
+    ('hr', re.compile(r'\bhr\b|personal|recruitment|rekruttering', re.IGNORECASE)),
+    ('spørgsmål', re.compile(r'spørgsmål|questions|yderligere|further|mere\s+info|more\s+info', re.IGNORECASE)),
+    ('leder', re.compile(r'manager|leder|chef', re.IGNORECASE)),
+    ('email', re.compile(r'e-?mail|\bmail\b|\bsend\b', re.IGNORECASE)),
+]
+
+# Characters before an email that are searched for a context keyword
+CONTEXT_WINDOW = 60
+
+# Contexts that mark an address as the one to contact about the job
+PREFERRED_CONTEXTS = ('kontakt', 'ansøg', 'hr')
+
+# Shared mailboxes that are rarely the right contact for a specific posting
+GENERIC_MAILBOX_RE = re.compile(
+    r'(info|privacy|gdpr|dpo|persondata|noreply|no-reply|donotreply|support|webmaster|kundeservice)@',
+    re.IGNORECASE,
+)
+
+
+def classify_email_context(text, start, window=CONTEXT_WINDOW):
+    """Label an email at text[start:] by the keyword closest before it, or '' if none"""
+    preceding = text[max(0, start - window):start]
+    best_label, best_end = '', -1
+    for label, keyword_re in CONTEXT_KEYWORDS:
+        for match in keyword_re.finditer(preceding):
+            if match.end() > best_end:
+                best_label, best_end = label, match.end()
+    return best_label
+
+
+def find_emails(text):
+    """Return every email in the text, in order, as (email, context) pairs from a single scan"""
+    if '@' not in text:
+        return []
+    return [(match.group(0), classify_email_context(text, match.start())) for match in EMAIL_RE.finditer(text)]
+
+
+def choose_contact_email(text, first_hit):
+    """
+    The address to use as a posting's contact email when the context is preferred
+
+    Opt-in (prefer_contact); by default the extractors return the first hit.
+    first_hit is what the original first-match extraction found. It is kept
+    unless it is a generic mailbox (info@, privacy@, ...) or another address
+    is introduced as a contact, application or HR address, in which case the
+    first such non-generic address wins.
+    """
+    if not first_hit:
+        return first_hit
+    candidates = [(email, context) for email, context in find_emails(text) if not GENERIC_MAILBOX_RE.match(email)]
+    for email, context in candidates:
+        if context in PREFERRED_CONTEXTS:
+            return email
+    if GENERIC_MAILBOX_RE.match(first_hit) and candidates:
+        return candidates[0][0]
+    return first_hit
+
+
+def first_text_email(text, prefer_contact=False):
+    """
+    First email in free text: the word-bounded match if there is one, otherwise
+    any match; with prefer_contact, choose_contact_email may pick another address
+    """
+    if '@' not in text:
+        return ""
+    match = BOUNDED_EMAIL_RE.search(text) or EMAIL_RE.search(text)
+    email = match.group(0).strip() if match else ""
+    return choose_contact_email(text, email) if prefer_contact else email
+
+
+def first_detail_page_email(text, prefer_contact=False):
+    """
+    First contact email in a detail page's text
+
+    Gives the same result as trying FinalJobindexScraper's 16 detail-page
+    patterns one after another, but the common case is a single compiled scan.
+    With prefer_contact, choose_contact_email may pick another address instead.
+    """
+    email = _first_detail_page_hit(text)
+    return choose_contact_email(text, email) if prefer_contact else email
+
+
+def _first_detail_page_hit(text):
+    if '@' not in text:
+        return ""
+    match = BOUNDED_EMAIL_RE.search(text)
+    if match:
+        return match.group(0).strip()
+    if not EMAIL_RE.search(text):
+        # Every labelled pattern needs an EMAIL_RE match, so none of them can hit
+        return ""
+    for pattern in DETAIL_PAGE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(2).strip()
+    return ""
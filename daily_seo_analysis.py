@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
@@ -10,6 +9,9 @@ from datetime import datetime
 import logging
 import pytz
 
+from http_transport import shared_session
+from rate_limiter import paced_get, shared_limiter
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,10 +24,12 @@ logging.basicConfig(
 
 class DailySEOAnalyzer:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Shared pool with retries and circuit breaker; requests' default headers with a browser User-Agent
+        self.session = shared_session(headers={
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
         
     def check_google_ranking(self, search_query="snowflake consultants copenhagen"):
         """Check Devoteam's Google ranking for the search query"""
@@ -34,7 +38,7 @@ class DailySEOAnalyzer:
         url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = paced_get(self.session, url, self.limiter, timeout=10)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -96,7 +100,7 @@ class DailySEOAnalyzer:
         
         try:
             start_time = time.time()
-            response = self.session.get(url, timeout=10)
+            response = paced_get(self.session, url, self.limiter, timeout=10)
             load_time = time.time() - start_time
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -454,7 +458,6 @@ def main():
     for page_url in pages_to_analyze:
         page_data = analyzer.analyze_page_seo(page_url)
         page_analyses.append(page_data)
-        time.sleep(2)  # Be respectful to servers
     
     # Combine all data
     analysis_data = {
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Description Extractor
+Streaming text extraction for posting descriptions. The HTML is parsed
+incrementally, text BeautifulSoup's get_text leaves out (script, style,
+template, ruby annotations, comments) is skipped, whitespace is normalized as
+it arrives and parsing stops as soon as the length cap is exceeded, so a huge
+posting costs about as much as a short one.
+
+The result is identical to the scrapers' original approach:
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    if len(text) > 500:
+        text = text[:500] + "..."
+"""
+
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+
+DESCRIPTION_MAX_LENGTH = 500
+
+# Tags whose strings BeautifulSoup stores as Script, Stylesheet, TemplateString etc., which get_text skips
+EXCLUDED_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+VOID_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+PRESERVE_WHITESPACE_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+
+# str.splitlines() boundaries
+LINE_BREAKS = frozenset('\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029')
+
+DECIMAL_REFERENCE_RE = re.compile(r'^([0-9]+)(.*)')
+HEX_REFERENCE_RE = re.compile(r'^([0-9a-f]+)(.*)')
+
+# First chunk fed to the parser; each later chunk is twice as large, so an
+# unterminated <script> is rescanned O(n) times in total rather than O(n^2)
+FIRST_CHUNK_SIZE = 1024
+
+
+def _numeric_reference(name):
+    """(character, trailing text) for a numeric character reference, resolved the way BeautifulSoup does"""
+    base, pattern = 10, DECIMAL_REFERENCE_RE
+    if name.startswith(('x', 'X')):
+        base, pattern, name = 16, HEX_REFERENCE_RE, name[1:]
+    extra = ''
+    try:
+        number = int(name, base)
+    except ValueError:
+        match = pattern.search(name)
+        if match is None:
+            return '', name
+        number, extra = int(match.group(1), base), match.group(2)
+    character, _ = UnicodeDammit.numeric_character_reference(number)
+    return character, extra
+
+
+class DescriptionTextParser(HTMLParser):
+    def __init__(self, max_length=DESCRIPTION_MAX_LENGTH):
+        """
+        Incremental parser producing a posting's normalized description text
+
+        Mirrors BeautifulSoup's html.parser tree builder closely enough to see
+        the same strings: the open-tag stack decides which strings are skipped,
+        and whitespace-only strings collapse to a single space or newline.
+
+        Args:
+            max_length (int): Stop once the normalized text is longer than this
+        """
+        super().__init__(convert_charrefs=False)
+        self.max_length = max_length
+        self.done = False
+        self.stalled = False
+        self._stack = []
+        self._excluded = 0
+        self._preserved = 0
+        # Void tags closed on the spot; a later </br> for one of them is ignored entirely
+        self._closed_void = []
+        # Current string: whitespace-only data held back until it is known to
+        # be all whitespace, or None once real text has been passed through
+        self._spaces = []
+        self._has_data = False
+        # Normalized output so far, and the unfinished phrase at its end
+        self._phrases = []
+        self._length = 0
+        self._partial = ''
+
+    # Output
+
+    def _add_phrase(self, phrase):
+        if phrase:
+            self._length += len(phrase) + (1 if self._phrases else 0)
+            self._phrases.append(phrase)
+            if self._length > self.max_length:
+                self.done = True
+
+    def _emit(self, text):
+        """Normalize text onto the output: split on line breaks and double spaces, strip, drop empties"""
+        pending = self._partial + text
+        lines = pending.splitlines()
+        partial = '' if not lines or pending[-1] in LINE_BREAKS else lines.pop()
+        for line in lines:
+            for phrase in line.split("  "):
+                self._add_phrase(phrase.strip())
+
+        # Phrases before the last double space of an unfinished line are final already
+        phrases = partial.split("  ")
+        for phrase in phrases[:-1]:
+            self._add_phrase(phrase.strip())
+        self._partial = phrases[-1]
+
+        # The unfinished phrase only grows, so once it pushes the text past the cap we are done
+        partial = self._partial.strip()
+        if partial and self._length + len(partial) + (1 if self._phrases else 0) > self.max_length:
+            self.done = True
+
+    def _end_string(self):
+        """BeautifulSoup.endData: a whitespace-only string becomes a single newline or space"""
+        if self._has_data and self._spaces is not None:
+            spaces = ''.join(self._spaces)
+            self._emit('\n' if '\n' in spaces else ' ')
+        self._spaces = []
+        self._has_data = False
+
+    def _string_data(self, data):
+        self._has_data = True
+        if self._spaces is None:
+            self._emit(data)
+        elif self._preserved or data.strip(BeautifulSoup.ASCII_SPACES):
+            self._emit(''.join(self._spaces) + data)
+            self._spaces = None
+        else:
+            self._spaces.append(data)
+
+    def text(self):
+        """The normalized text, capped at max_length characters plus '...'"""
+        partial = self._partial.strip()
+        text = ' '.join(self._phrases + [partial] if partial else self._phrases)
+        if len(text) > self.max_length:
+            text = text[:self.max_length] + "..."
+        return text
+
+    # Tree
+
+    def _push(self, tag):
+        self._stack.append(tag)
+        self._excluded += tag in EXCLUDED_TAGS
+        self._preserved += tag in PRESERVE_WHITESPACE_TAGS
+
+    def _pop_to(self, tag):
+        if tag in self._stack:
+            while True:
+                popped = self._stack.pop()
+                self._excluded -= popped in EXCLUDED_TAGS
+                self._preserved -= popped in PRESERVE_WHITESPACE_TAGS
+                if popped == tag:
+                    break
+
+    # HTMLParser events
+
+    def handle_starttag(self, tag, attrs):
+        self._end_string()
+        if tag in VOID_TAGS:
+            self._closed_void.append(tag)
+        else:
+            self._push(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_string()
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_void:
+            self._closed_void.remove(tag)
+            return
+        self._end_string()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        if data == '&#' and self.cdata_elem is None:
+            # html.parser gave up on a malformed "&#" and parses nothing more
+            # until close(), so what follows depends on how the input was split
+            self.stalled = True
+        if not self._excluded:
+            self._string_data(data)
+
+    def handle_charref(self, name):
+        character, extra = _numeric_reference(name)
+        self.handle_data(character)
+        self.handle_data(extra)
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else "&%s" % name)
+
+    def handle_comment(self, data):
+        self._end_string()
+
+    def handle_decl(self, decl):
+        self._end_string()
+
+    def handle_pi(self, data):
+        self._end_string()
+
+    def unknown_decl(self, data):
+        # CDATA sections are kept by get_text, even inside skipped tags
+        self._end_string()
+        if data.upper().startswith("CDATA["):
+            self._string_data(data[len("CDATA["):])
+            self._end_string()
+
+    def close(self):
+        super().close()
+        self._end_string()
+        self._add_phrase(self._partial.strip())
+        self._partial = ''
+
+
+def extract_description(html_content, max_length=DESCRIPTION_MAX_LENGTH):
+    """
+    Normalized text of an HTML fragment, cut to max_length characters plus '...'
+
+    Feeds the HTML to the parser in growing chunks and stops as soon as the
+    text is known to exceed max_length.
+    """
+    if not html_content:
+        return ""
+
+    parser = DescriptionTextParser(max_length)
+    position, chunk_size = 0, FIRST_CHUNK_SIZE
+    while position < len(html_content) and not parser.done and not parser.stalled:
+        parser.feed(html_content[position:position + chunk_size])
+        position += chunk_size
+        chunk_size *= 2
+
+    if parser.stalled and not parser.done:
+        # Feed it in one piece, as BeautifulSoup does
+        parser = DescriptionTextParser(max_length)
+        parser.feed(html_content)
+    if not parser.done:
+        parser.close()
+    return parser.text()
@@ -4,81 +4,222 @@ Final Jobindex Scraper
 Extracts actual job postings from Jobindex.dk by parsing embedded JSON data
 """
 
-import requests
 import json
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
 import time
 import re
+import threading
+import os
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from contact_extractor import EMAIL_RE, first_detail_page_email, first_text_email
+from description_extractor import extract_description
+from http_transport import http2_available, shared_http2_session, shared_session
+from job_enrichment import enrich_postings
+from job_posting import JobPosting, posting_json_default
+from job_sink import JsonlJobSink, iter_jsonl_jobs, latest_run_id
+from keyword_index import KeywordIndex
+from page_cache import PageCache
+from rate_limiter import AdaptiveRateLimiter, paced_get
+from scrape_state import ScrapeStateStore, posting_hash
+
+
+# Marker that precedes the embedded Stash JSON object in Jobindex search pages
+STASH_MARKER = b'var Stash = '
+STASH_DECODER = json.JSONDecoder()
+
+
+def decode_stash(text, start=0):
+    """Decode the JSON object that follows 'var Stash = ' in text, or return None"""
+    marker = STASH_MARKER.decode('ascii')
+    index = text.find(marker, start)
+    if index == -1:
+        return None
+    stash_data, _ = STASH_DECODER.raw_decode(text, index + len(marker))
+    return stash_data
+
+
+def search_response_from_stash(stash_data):
+    """Pick the job searchResponse out of decoded Stash data, or return None"""
+    if not isinstance(stash_data, dict):
+        return None
+    job_data = stash_data.get('jobsearch/result_app', {})
+    search_response = job_data.get('storeData', {}).get('searchResponse')
+    if search_response and 'results' in search_response:
+        return search_response
+    return None
+
+
+class ResultFragment:
+    def __init__(self, html_content):
+        """Hold one result's HTML and lazily parse it once for all extractors"""
+        self.html = html_content or ""
+        self._soup = None
+        self._text = None
+    
+    @classmethod
+    def wrap(cls, html_content):
+        """Return html_content itself if it is already a fragment, else a new fragment for it"""
+        return html_content if isinstance(html_content, cls) else cls(html_content)
+    
+    @property
+    def soup(self):
+        """The parsed fragment; extractors must not modify it"""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, 'html.parser')
+        return self._soup
+    
+    @property
+    def text(self):
+        """Cached soup.get_text()"""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
 
 
 class FinalJobindexScraper:
-    def __init__(self):
-        """Initialize the scraper"""
+    def __init__(self, detail_cache=None, state_store=None, sink=None, http2=False, prefer_contact_emails=False):
+        """
+        Initialize the scraper
+        
+        Args:
+            detail_cache (PageCache): Optional persistent cache for job detail pages
+            state_store (ScrapeStateStore): Optional seen-posting state for incremental runs
+            sink (JsonlJobSink): Optional sink every new posting is streamed to as it is scraped
+            http2 (bool): Fetch search and detail pages over one multiplexed HTTP/2
+                connection per host (needs httpx[http2]; falls back to HTTP/1.1 without it)
+            prefer_contact_emails (bool): Instead of the first email found, prefer one
+                introduced as a contact/application/HR address over generic mailboxes
+        """
         self.base_url = "https://www.jobindex.dk"
+        self.detail_cache = detail_cache
+        self.state_store = state_store
+        self.sink = sink
+        self.prefer_contact_emails = prefer_contact_emails
+        # TIDs reused unchanged from state_store, and content hashes of the ones extracted this run
+        self.unchanged_tids = set()
+        self.pending_hashes = {}
         self.jobs = []
-        self.session = requests.Session()
-        
-        # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0',
-        })
+        # TID -> job for everything in self.jobs, kept across scrape_jobs calls
+        self.job_index = {}
+        # Search term -> number of results skipped because their TID was already scraped
+        self.duplicates_by_term = {}
+        # Search term -> total hit count reported by the Stash searchResponse
+        self.hit_counts = {}
+        # Search term -> every TID the term returned, new or duplicate
+        self.term_tids = {}
+        # Guards job_index/jobs and the per-term stats when terms run concurrently
+        self.index_lock = threading.Lock()
+        # Paces search page requests, including prefetched pages, across all terms;
+        # starts at one request per second and adapts to how the host responds
+        self.search_limiter = AdaptiveRateLimiter(1.0)
+        # Shared pooled session with retries, circuit breaker and default headers,
+        # or its multiplexed HTTP/2 counterpart
+        if http2 and not http2_available():
+            print("⚠️ HTTP/2 requested but httpx[http2] is not installed; using pooled HTTP/1.1")
+            http2 = False
+        self.session = shared_http2_session() if http2 else shared_session()
     
     def _fetch_job_details(self, job_url):
         """Fetch detailed job information from individual job URL"""
+        return self._fetch_job_details_with_status(job_url)['contact_email']
+    
+    def _fetch_job_details_with_status(self, job_url, limiter=None):
+        """
+        Fetch a job detail page and return its contact email with HTTP status and timing
+        
+        With a detail_cache, fresh pages are served from disk, stale ones are
+        revalidated with a conditional GET, and the limiter (if any) is only
+        consulted when the network is actually used.
+        """
+        started = time.perf_counter()
+        result = {'url': job_url, 'contact_email': "", 'status': None, 'elapsed': 0.0, 'error': None, 'cache': None}
         try:
-            response = self.session.get(job_url, headers=self.session.headers, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for contact information in the detailed job description
-                job_text = soup.get_text()
-                
-                # Enhanced email patterns for detailed descriptions
-                email_patterns = [
-                    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                    r'(email|e-mail|mail):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(kontakt|contact):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(ansøg|apply|application):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(hr|personal|recruitment):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(send|email|mail)\s+til\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(kontakt|contact)\s+os\s+på\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(spørgsmål|questions):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(yderligere|further)\s+information:\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(for\s+mere\s+info|for\s+more\s+info):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(ansøgningsfrist|deadline):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(søg\s+jobbet|apply\s+for\s+position):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(kontaktperson|contact person|ansøgningsansvarlig):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(manager|leder|chef):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(ansøg til|apply to|send ansøgning til):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                    r'(jobansøgning|job application):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-                ]
-                
-                for pattern in email_patterns:
-                    matches = re.findall(pattern, job_text, re.IGNORECASE)
-                    if matches:
-                        for match in matches:
-                            if isinstance(match, tuple):
-                                for part in match:
-                                    if '@' in part:
-                                        return part.strip()
-                            else:
-                                if '@' in match:
-                                    return match.strip()
-                
-                return ""
-            else:
-                return ""
+            cached = self.detail_cache.get(job_url) if self.detail_cache else None
+            if cached and self.detail_cache.is_fresh(cached):
+                result['status'] = 200
+                result['cache'] = 'hit'
+                result['contact_email'] = self._extract_contact_email_from_detail_page(cached['body'])
+                result['elapsed'] = time.perf_counter() - started
+                return result
+            
+            headers = dict(self.session.headers)
+            if cached:
+                headers.update(self.detail_cache.conditional_headers(cached))
+            response = paced_get(self.session, job_url, limiter, headers=headers, timeout=10)
+            result['status'] = response.status_code
+            
+            if response.status_code == 304 and cached:
+                # Unchanged since we stored it
+                self.detail_cache.touch(job_url)
+                result['cache'] = 'revalidated'
+                result['contact_email'] = self._extract_contact_email_from_detail_page(cached['body'])
+            elif response.status_code == 200:
+                if self.detail_cache:
+                    self.detail_cache.put(
+                        job_url, response.content,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                    result['cache'] = 'miss'
+                result['contact_email'] = self._extract_contact_email_from_detail_page(response.content)
         except Exception as e:
             print(f"Error fetching job details: {e}")
-            return ""
+            result['error'] = str(e)
+        result['elapsed'] = time.perf_counter() - started
+        return result
+    
+    def fetch_job_details_concurrently(self, job_urls, max_workers=4, requests_per_second=2.0, burst=None):
+        """
+        Fetch many job detail pages with bounded concurrency
+        
+        Requests are spread over a thread pool and paced per host with an
+        adaptive token bucket: the rate starts at requests_per_second, grows
+        while responses stay fast and healthy, and halves on 429/503, errors
+        or rising latency, so max_workers only overlaps network latency.
+        
+        Args:
+            job_urls (list): Detail page URLs
+            max_workers (int): Maximum requests in flight
+            requests_per_second (float): Starting request rate per host
+            burst (float): Token bucket capacity, defaults to a single request
+        
+        Returns:
+            list: One dict per URL, in input order, with url, contact_email,
+                status, elapsed (seconds) and error
+        """
+        limiter = AdaptiveRateLimiter(requests_per_second, capacity=burst)
+        
+        def fetch(job_url):
+            return self._fetch_job_details_with_status(job_url, limiter)
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() yields in submission order regardless of completion order
+            results = list(executor.map(fetch, job_urls))
+        elapsed = time.perf_counter() - started
+        
+        if results:
+            ok = sum(1 for r in results if r['status'] == 200)
+            avg_latency = sum(r['elapsed'] for r in results) / len(results)
+            cached = sum(1 for r in results if r['cache'] in ('hit', 'revalidated'))
+            print(f"Fetched {len(results)} detail pages in {elapsed:.1f}s "
+                  f"({len(results) / max(elapsed, 1e-9):.1f} pages/s, {ok} OK, {cached} from cache, "
+                  f"avg latency {avg_latency:.2f}s)")
+        return results
+    
+    def _extract_contact_email_from_detail_page(self, page_content):
+        """Find the first contact email in a job detail page"""
+        soup = BeautifulSoup(page_content, 'html.parser')
+        
+        # Look for contact information in the detailed job description
+        job_text = soup.get_text()
+        
+        # One compiled scan covers the 16 detail-page patterns in their original priority
+        return first_detail_page_email(job_text, prefer_contact=self.prefer_contact_emails)
 
     def scrape_jobs_with_detailed_contact_search(self, num_jobs=20):
         """Scrape jobs and search for contact info in detailed descriptions"""
@@ -87,37 +228,42 @@ class FinalJobindexScraper:
         # First get the basic job list
         self.scrape_jobs(num_jobs, "")
         
-        # Now fetch detailed information for each job
+        # Now fetch detailed information for each job, one request per second
         jobs_with_emails = []
+        jobs_to_check = [job for job in self.jobs[:num_jobs] if job.get('url')]
+        details = self.fetch_job_details_concurrently(
+            [job['url'] for job in jobs_to_check], requests_per_second=1.0
+        )
         
-        for i, job in enumerate(self.jobs[:num_jobs], 1):
-            print(f"Checking job {i}/{num_jobs}: {job.get('title', 'Unknown')}")
+        for i, (job, detail) in enumerate(zip(jobs_to_check, details), 1):
+            print(f"Checking job {i}/{len(jobs_to_check)}: {job.get('title', 'Unknown')} "
+                  f"[{detail['status']}, {detail['elapsed']:.2f}s]")
             
-            job_url = job.get('url', '')
-            if job_url:
-                # Fetch detailed job description
-                contact_email = self._fetch_job_details(job_url)
-                if contact_email:
-                    job['contact_email'] = contact_email
-                    jobs_with_emails.append(job)
-                    print(f"  ✅ Found email: {contact_email}")
-                else:
-                    print(f"  ❌ No email found")
-            
-            # Small delay to be respectful
-            time.sleep(1)
+            contact_email = detail['contact_email']
+            if contact_email:
+                job['contact_email'] = contact_email
+                jobs_with_emails.append(job)
+                print(f"  ✅ Found email: {contact_email}")
+            else:
+                print(f"  ❌ No email found")
         
         print(f"Found {len(jobs_with_emails)} jobs with contact emails in detailed descriptions")
         return jobs_with_emails
 
-    def scrape_jobs(self, num_jobs=10, search_term="", location=""):
+    def scrape_jobs(self, num_jobs=10, search_term="", location="", page_concurrency=2, max_pages=None):
         """
         Scrape actual job postings from Jobindex
         
+        Follows the search result pages until num_jobs new jobs are collected or
+        the hit count reported by the page is exhausted. Up to page_concurrency
+        later pages are fetched in the background while the current one is parsed.
+        
         Args:
             num_jobs (int): Number of jobs to scrape
             search_term (str): Job search term
             location (str): Location to search in
+            page_concurrency (int): Result pages fetched ahead of the one being parsed
+            max_pages (int): Optional cap on result pages per search URL
         """
         try:
             print(f"Starting to scrape {num_jobs} real job postings from Jobindex...")
@@ -133,6 +279,10 @@ class FinalJobindexScraper:
             for search_url in search_urls:
                 if jobs_scraped >= num_jobs:
                     break
+                if self._hitcount_covered(search_term):
+                    # An earlier search URL already returned every hit; the rest would be duplicates
+                    print(f"All {self.hit_counts[search_term]} hits seen; skipping {search_url}")
+                    break
                     
                 try:
                     print(f"Trying search URL: {search_url}")
@@ -144,72 +294,280 @@ class FinalJobindexScraper:
                     if location:
                         params['location'] = location
                     
-                    # Make the request
-                    response = self.session.get(search_url, params=params, timeout=15)
-                    response.raise_for_status()
-                    
-                    # Parse the HTML
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    # The first page tells us how many pages there are
+                    content = self._fetch_search_page(search_url, params, 1)
+                    page_jobs, search_response = self._parse_search_page(content, num_jobs - jobs_scraped)
+                    jobs_scraped = self._add_scraped_jobs(page_jobs, num_jobs, jobs_scraped, search_term)
                     
-                    # Extract job data from embedded JSON
-                    page_jobs = self._extract_jobs_from_json(soup, num_jobs - jobs_scraped)
+                    total_pages = 1
+                    if search_response:
+                        hitcount = search_response.get('hitcount') or 0
+                        page_size = search_response.get('page_size') or len(search_response.get('results', [])) or 1
+                        total_pages = -(-hitcount // page_size)
+                        if max_pages:
+                            total_pages = min(total_pages, max_pages)
+                        self.hit_counts[search_term] = hitcount
+                        print(f"Search reports {hitcount} hits over {total_pages} pages")
                     
-                    for job in page_jobs:
-                        if jobs_scraped >= num_jobs:
-                            break
-                        
-                        # Check if this job is not already scraped
-                        if not any(existing_job.get('tid') == job.get('tid') 
-                                 for existing_job in self.jobs):
-                            self.jobs.append(job)
-                            jobs_scraped += 1
-                            print(f"Scraped job {jobs_scraped}: {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}")
-                    
-                    time.sleep(2)  # Be respectful
+                    jobs_scraped = self._scrape_remaining_pages(
+                        search_url, params, total_pages, page_concurrency, num_jobs, jobs_scraped, search_term
+                    )
                     
                 except Exception as e:
                     print(f"Error scraping from {search_url}: {e}")
                     continue
             
-            print(f"Successfully scraped {len(self.jobs)} real jobs")
+            print(f"Successfully scraped {len(self.jobs)} real jobs "
+                  f"({self.duplicates_by_term.get(search_term, 0)} duplicates skipped for '{search_term}')")
             
         except Exception as e:
             print(f"Error during scraping: {e}")
     
+    def _fetch_search_page(self, search_url, params, page):
+        """Fetch one page of search results and return the raw body"""
+        page_params = dict(params)
+        if page > 1:
+            page_params['page'] = page
+        
+        response = paced_get(self.session, search_url, self.search_limiter, params=page_params, timeout=15)
+        response.raise_for_status()
+        return response.content
+    
+    def _scrape_remaining_pages(self, search_url, params, total_pages, page_concurrency, num_jobs, jobs_scraped, search_term):
+        """Parse pages 2..total_pages in order while prefetching the next ones on a thread pool"""
+        if total_pages < 2 or jobs_scraped >= num_jobs:
+            return jobs_scraped
+        
+        with ThreadPoolExecutor(max_workers=max(1, page_concurrency)) as executor:
+            pending = deque()
+            next_page = 2
+            
+            while jobs_scraped < num_jobs and (pending or next_page <= total_pages):
+                if self._hitcount_covered(search_term):
+                    print(f"All {self.hit_counts[search_term]} hits seen; stopping before page {pending[0][0] if pending else next_page}")
+                    break
+                # Keep the prefetch window full
+                while next_page <= total_pages and len(pending) < max(1, page_concurrency):
+                    pending.append((next_page, executor.submit(self._fetch_search_page, search_url, params, next_page)))
+                    next_page += 1
+                
+                page, future = pending.popleft()
+                try:
+                    content = future.result()
+                except Exception as e:
+                    print(f"Error fetching page {page} of {search_url}: {e}")
+                    continue
+                
+                page_jobs, _ = self._parse_search_page(content, num_jobs - jobs_scraped)
+                if not page_jobs:
+                    print(f"No results on page {page}; stopping")
+                    break
+                jobs_scraped = self._add_scraped_jobs(page_jobs, num_jobs, jobs_scraped, search_term)
+            
+            # Don't wait on prefetched pages we no longer need
+            for _, future in pending:
+                future.cancel()
+        
+        return jobs_scraped
+    
+    def _hitcount_covered(self, search_term):
+        """True once the term has returned as many distinct TIDs as its search reported hits"""
+        with self.index_lock:
+            hitcount = self.hit_counts.get(search_term)
+            return hitcount is not None and len(self.term_tids.get(search_term, ())) >= hitcount
+    
+    def _add_scraped_jobs(self, page_jobs, num_jobs, jobs_scraped, search_term):
+        """Append jobs whose TID hasn't been seen, up to num_jobs; returns the new jobs_scraped"""
+        with self.index_lock:
+            term_tids = self.term_tids.setdefault(search_term, set())
+            for job in page_jobs:
+                if jobs_scraped >= num_jobs:
+                    break
+                
+                if job.get('tid'):
+                    term_tids.add(job['tid'])
+                
+                # Check if this job is not already scraped
+                if job.get('tid') in self.job_index:
+                    self.duplicates_by_term[search_term] = self.duplicates_by_term.get(search_term, 0) + 1
+                    continue
+                
+                self.job_index[job.get('tid')] = job
+                self.jobs.append(job)
+                if self.sink:
+                    self.sink.write(job)
+                jobs_scraped += 1
+                print(f"Scraped job {jobs_scraped}: {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}")
+        
+        return jobs_scraped
+    
+    def resume_from_sink(self):
+        """Reload the postings an interrupted run already streamed to the sink; returns how many"""
+        resumed = 0
+        for job in iter_jsonl_jobs(self.sink.pattern):
+            if job.get('tid') in self.job_index:
+                continue
+            job = JobPosting.from_dict(job)
+            self.job_index[job.get('tid')] = job
+            self.jobs.append(job)
+            resumed += 1
+        return resumed
+    
+    def scrape_terms_concurrently(self, terms, max_workers=4, page_concurrency=2):
+        """
+        Run scrape_jobs for many search terms at once
+        
+        All terms share the TID index and the per-host search rate limit, so
+        adding workers overlaps latency without raising the request rate.
+        
+        Args:
+            terms (list): (search_term, num_jobs) pairs, e.g. from load_search_terms()
+            max_workers (int): Search terms scraped in parallel
+            page_concurrency (int): Result pages prefetched per term
+        
+        Returns:
+            dict: Per-term statistics from term_statistics()
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.scrape_jobs, num_jobs=num_jobs, search_term=term, page_concurrency=page_concurrency)
+                for term, num_jobs in terms
+            ]
+            for future in futures:
+                future.result()
+        
+        return self.term_statistics()
+    
+    def term_statistics(self):
+        """Hits, new jobs, duplicates and overlap with other terms for every scraped search term"""
+        stats = {}
+        with self.index_lock:
+            # Number of terms that returned each TID
+            term_counts = Counter(tid for tids in self.term_tids.values() for tid in tids)
+            for term, tids in self.term_tids.items():
+                overlap = sum(1 for tid in tids if term_counts[tid] > 1)
+                stats[term] = {
+                    'hits': len(tids),
+                    'total_hits': self.hit_counts.get(term, 0),
+                    'duplicates': self.duplicates_by_term.get(term, 0),
+                    'overlap': overlap,
+                    'unique_to_term': len(tids) - overlap,
+                }
+        return stats
+    
+    def _parse_search_page(self, content, max_jobs):
+        """Parse a search page body into (jobs, searchResponse or None)"""
+        # Fast path: decode the Stash object straight from the raw bytes, no HTML parse
+        try:
+            search_response = self._extract_search_response_from_bytes(content)
+        except Exception as e:
+            print(f"Error decoding Stash data, falling back to HTML parsing: {e}")
+            search_response = None
+        
+        if search_response:
+            jobs = self._jobs_from_search_response(search_response, max_jobs)
+            if jobs:
+                return jobs, search_response
+        
+        soup = BeautifulSoup(content, 'html.parser')
+        try:
+            search_response = self._extract_search_response(soup)
+        except Exception as e:
+            print(f"Error extracting jobs from JSON: {e}")
+            search_response = None
+        
+        jobs = self._jobs_from_search_response(search_response, max_jobs) if search_response else []
+        if not jobs:
+            jobs = self._extract_jobs_from_alternative_sources(soup, max_jobs)
+        return jobs, search_response
+    
+    def _extract_search_response_from_bytes(self, content):
+        """Return the searchResponse by locating the Stash marker in the raw page, or None"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        
+        index = content.find(STASH_MARKER)
+        if index == -1:
+            return None
+        
+        # Only the tail from the marker on needs decoding; raw_decode stops at the object's end
+        return search_response_from_stash(decode_stash(content[index:].decode('utf-8', errors='replace')))
+    
+    def _extract_search_response(self, soup):
+        """Return the searchResponse dict from the page's embedded Stash data, or None"""
+        # Look for the Stash variable that contains job data
+        scripts = soup.find_all('script')
+        
+        for script in scripts:
+            if script.string and 'Stash' in script.string:
+                # Decode the whole object; a non-greedy regex can stop at a nested '};'
+                search_response = search_response_from_stash(decode_stash(script.string))
+                if search_response:
+                    return search_response
+        
+        return None
+    
+    def _jobs_from_search_response(self, search_response, max_jobs):
+        """Parse up to max_jobs results of a searchResponse into job dicts"""
+        jobs = []
+        # Newly parsed jobs with result HTML, enriched with salary and job type as one batch
+        parsed_jobs, parsed_htmls = [], []
+        for result in search_response['results'][:max_jobs]:
+            job_info = self._reuse_unchanged_job(result) if self.state_store else None
+            if job_info is None:
+                job_info = self._parse_job_result(result)
+                if job_info and result.get('html'):
+                    parsed_jobs.append(job_info)
+                    parsed_htmls.append(result['html'])
+            if job_info:
+                jobs.append(job_info)
+        
+        try:
+            enrich_postings(parsed_jobs, parsed_htmls)
+        except Exception as e:
+            print(f"Error extracting salary and job type: {e}")
+        print(f"Found {len(jobs)} jobs from JSON data")
+        return jobs
+    
+    def _reuse_unchanged_job(self, result):
+        """Return the stored job for a result whose content hash matches the last run, else None"""
+        if not isinstance(result, dict) or not result.get('tid'):
+            return None
+        
+        tid = result['tid']
+        content_hash = posting_hash(result)
+        previous = self.state_store.lookup(tid)
+        if previous and previous['content_hash'] == content_hash:
+            self.unchanged_tids.add(tid)
+            return JobPosting.from_dict(previous['job'])
+        
+        self.pending_hashes[tid] = content_hash
+        return None
+    
+    def save_state(self, jobs, detail_emails=None):
+        """
+        Record new and changed jobs in the state store, with the detail-page email
+        where one was fetched successfully (also for unchanged jobs refetched
+        because an earlier fetch failed)
+        """
+        if not self.state_store:
+            return
+        detail_emails = detail_emails or {}
+        for job in jobs:
+            tid = job.get('tid')
+            if tid in self.pending_hashes:
+                self.state_store.upsert(tid, self.pending_hashes[tid], job, detail_emails.get(tid))
+            elif tid in detail_emails:
+                self.state_store.record_detail_email(tid, detail_emails[tid])
+    
     def _extract_jobs_from_json(self, soup, max_jobs):
         """Extract job data from embedded JSON in the page"""
         jobs = []
         
         try:
-            # Look for the Stash variable that contains job data
-            scripts = soup.find_all('script')
-            
-            for script in scripts:
-                if script.string and 'Stash' in script.string:
-                    # Extract the JSON data from the Stash variable
-                    stash_match = re.search(r'var Stash = ({.*?});', script.string, re.DOTALL)
-                    if stash_match:
-                        stash_data = json.loads(stash_match.group(1))
-                        
-                        # Look for job search results
-                        if 'jobsearch/result_app' in stash_data:
-                            job_data = stash_data['jobsearch/result_app']
-                            
-                            # Extract search response
-                            if 'storeData' in job_data and 'searchResponse' in job_data['storeData']:
-                                search_response = job_data['storeData']['searchResponse']
-                                
-                                # Extract results
-                                if 'results' in search_response:
-                                    results = search_response['results']
-                                    
-                                    for result in results[:max_jobs]:
-                                        job_info = self._parse_job_result(result)
-                                        if job_info:
-                                            jobs.append(job_info)
-                                    
-                                    print(f"Found {len(jobs)} jobs from JSON data")
-                                    break
+            search_response = self._extract_search_response(soup)
+            if search_response:
+                jobs = self._jobs_from_search_response(search_response, max_jobs)
             
             # If we didn't find jobs in Stash, try alternative methods
             if not jobs:
@@ -229,6 +587,9 @@ class FinalJobindexScraper:
             if isinstance(result, str):
                 return None
             
+            # Parse the result's HTML once and share it between all extractors
+            fragment = ResultFragment(result.get('html', ''))
+            
             job_info = {
                 'tid': result.get('tid', ''),
                 'title': result.get('headline', ''),
@@ -238,7 +599,7 @@ class FinalJobindexScraper:
                 'addresses': result.get('addresses', []),
                 'posted_date': result.get('firstdate', ''),
                 'last_date': result.get('lastdate', ''),
-                'description': self._extract_description_from_html(result.get('html', '')),
+                'description': self._extract_description_from_html(fragment),
                 'url': result.get('url', ''),
                 'share_url': result.get('share_url', ''),
                 'rating': result.get('rating', {}),
@@ -254,116 +615,37 @@ class FinalJobindexScraper:
                 job_info['company_logo'] = company.get('logo', '')
                 job_info['company_profile_url'] = company.get('companyprofile_url', '')
             
-            # Extract salary, job type, and contact info from HTML if available
+            # Extract contact info from HTML if available; salary and job type
+            # are filled in per page by enrich_postings
             if result.get('html'):
-                html_content = result['html']
-                job_info['salary'] = self._extract_salary_from_html(html_content)
-                job_info['job_type'] = self._extract_job_type_from_html(html_content)
-                job_info['contact_person'] = self._extract_contact_person_from_html(html_content)
-                job_info['contact_email'] = self._extract_contact_email_from_html(html_content)
+                job_info['contact_person'] = self._extract_contact_person_from_html(fragment)
+                job_info['contact_email'] = self._extract_contact_email_from_html(fragment)
             
-            return job_info
+            return JobPosting.from_dict(job_info)
             
         except Exception as e:
             print(f"Error parsing job result: {e}")
             return None
     
     def _extract_description_from_html(self, html_content):
-        """Extract job description from HTML content"""
+        """Extract job description from HTML content (a string or a ResultFragment)"""
         try:
-            if not html_content:
-                return ""
-            
-            # Parse HTML to extract text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit length
-            if len(text) > 500:
-                text = text[:500] + "..."
-            
-            return text
+            # Streamed from the raw HTML, stopping at 500 characters, instead of
+            # taking the full text of the parsed fragment
+            return extract_description(ResultFragment.wrap(html_content).html)
             
         except Exception as e:
             print(f"Error extracting description: {e}")
             return ""
     
-    def _extract_salary_from_html(self, html_content):
-        """Extract salary information from HTML content"""
-        try:
-            if not html_content:
-                return ""
-            
-            # Look for salary patterns
-            salary_patterns = [
-                r'(\d+\.?\d*)\s*(kr|dkk|kroner)',
-                r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)\s*(kr|dkk|kroner)',
-                r'(løn|salary|compensation)',
-                r'(\d+\.?\d*)\s*(kr|dkk|kroner)\s*pr\.?\s*(måned|mnd|time)'
-            ]
-            
-            for pattern in salary_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                if matches:
-                    if isinstance(matches[0], tuple):
-                        return f"{matches[0][0]} - {matches[0][1]} {matches[0][2].upper()}"
-                    else:
-                        return f"{matches[0]} {matches[1].upper()}"
-            
-            return ""
-            
-        except Exception as e:
-            print(f"Error extracting salary: {e}")
-            return ""
-    
-    def _extract_job_type_from_html(self, html_content):
-        """Extract job type from HTML content"""
-        try:
-            if not html_content:
-                return ""
-            
-            # Look for job type patterns
-            job_type_patterns = [
-                r'\b(fuldtid|full.?time)\b',
-                r'\b(deltid|part.?time)\b',
-                r'\b(kontrakt|contract)\b',
-                r'\b(freelance|freelancer)\b',
-                r'\b(praktik|internship)\b',
-                r'\b(studiejob|student job)\b',
-                r'\b(graduate|trainee)\b'
-            ]
-            
-            for pattern in job_type_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                if matches:
-                    return matches[0].title()
-            
-            return ""
-            
-        except Exception as e:
-            print(f"Error extracting job type: {e}")
-            return ""
-    
     def _extract_contact_person_from_html(self, html_content):
-        """Extract contact person from HTML content"""
+        """Extract contact person from HTML content (a string or a ResultFragment)"""
         try:
-            if not html_content:
+            fragment = ResultFragment.wrap(html_content)
+            if not fragment.html:
                 return ""
             
-            # Parse HTML to extract text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            text = soup.get_text()
+            text = fragment.text
             
             # Look for contact person patterns
             contact_patterns = [
@@ -416,13 +698,14 @@ class FinalJobindexScraper:
             return ""
     
     def _extract_contact_email_from_html(self, html_content):
-        """Extract contact email from HTML content - enhanced version"""
+        """Extract contact email from HTML content (a string or a ResultFragment) - enhanced version"""
         try:
-            if not html_content:
+            fragment = ResultFragment.wrap(html_content)
+            if not fragment.html:
                 return ""
             
-            # Parse HTML to extract text and links
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Parsed HTML for text and links
+            soup = fragment.soup
             
             # Look for email links first
             email_links = soup.find_all('a', href=re.compile(r'^mailto:'))
@@ -431,39 +714,10 @@ class FinalJobindexScraper:
                 if '@' in email:
                     return email.strip()
             
-            # Look for email patterns in text - more comprehensive patterns
-            email_patterns = [
-                r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(email|e-mail|mail):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(kontakt|contact):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(ansøg|apply|application):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(hr|personal|recruitment):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(send|email|mail)\s+til\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(send|email|mail)\s+to\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(kontakt|contact)\s+os\s+på\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(kontakt|contact)\s+us\s+at\s+([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(spørgsmål|questions):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(yderligere|further)\s+information:\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(for\s+mere\s+info|for\s+more\s+info):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(ansøgningsfrist|deadline):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-                r'(søg\s+jobbet|apply\s+for\s+position):\s*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})'
-            ]
-            
-            text = soup.get_text()
-            for pattern in email_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            # Return the email part from tuple
-                            for part in match:
-                                if '@' in part:
-                                    return part.strip()
-                        else:
-                            # Single match
-                            if '@' in match:
-                                return match.strip()
+            # Look for emails in the text (first word-bounded match, else any match)
+            email = first_text_email(fragment.text, prefer_contact=self.prefer_contact_emails)
+            if email:
+                return email
             
             # Look for email in href attributes
             all_links = soup.find_all('a', href=True)
@@ -471,38 +725,17 @@ class FinalJobindexScraper:
                 href = link.get('href', '')
                 if '@' in href and 'mailto:' not in href:
                     # Extract email from href
-                    email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', href)
+                    email_match = EMAIL_RE.search(href)
                     if email_match:
-                        return email_match.group(1)
-            
-            # Look for company contact emails in the text
-            company_email_patterns = [
-                r'(info|kontakt|contact|hr|jobs|careers|recruitment|ansøg|apply)@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-                r'[a-zA-Z0-9._%+-]+@(company|firma|virksomhed|corp|inc|as|aps|a\/s)\.[a-zA-Z]{2,}',
-                r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.(dk|com|net|org|eu)',
-                r'(firstname|lastname|name)@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-                r'([a-zA-Z]+)\.([a-zA-Z]+)@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            ]
-            
-            for pattern in company_email_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            # Combine tuple parts
-                            email = ''.join(match) + '@' + match[0] if len(match) >= 2 else match[0]
-                        else:
-                            email = match
-                        if '@' in email:
-                            return email.strip()
+                        return email_match.group(0)
             
             # Look for emails in any script tags or data attributes
             scripts = soup.find_all('script')
             for script in scripts:
                 script_text = script.get_text()
-                email_matches = re.findall(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', script_text)
-                if email_matches:
-                    return email_matches[0].strip()
+                email_match = EMAIL_RE.search(script_text)
+                if email_match:
+                    return email_match.group(0).strip()
             
             # Look for emails in data attributes
             elements_with_data = soup.find_all(attrs={"data-email": True})
@@ -589,12 +822,12 @@ class FinalJobindexScraper:
             if desc_elem:
                 job_info['description'] = desc_elem.get_text(strip=True)
             
-            # Extract contact info from card HTML
-            card_html = str(card)
-            job_info['contact_person'] = self._extract_contact_person_from_html(card_html)
-            job_info['contact_email'] = self._extract_contact_email_from_html(card_html)
+            # Extract contact info from card HTML, parsed once for both extractors
+            card_fragment = ResultFragment(str(card))
+            job_info['contact_person'] = self._extract_contact_person_from_html(card_fragment)
+            job_info['contact_email'] = self._extract_contact_email_from_html(card_fragment)
             
-            return job_info if job_info['title'] else None
+            return JobPosting.from_dict(job_info) if job_info['title'] else None
             
         except Exception as e:
             print(f"Error extracting job from card: {e}")
@@ -631,12 +864,12 @@ class FinalJobindexScraper:
                     job_info['url'] = href
                     break
             
-            # Extract contact info from element HTML
-            element_html = str(element)
-            job_info['contact_person'] = self._extract_contact_person_from_html(element_html)
-            job_info['contact_email'] = self._extract_contact_email_from_html(element_html)
+            # Extract contact info from element HTML, parsed once for both extractors
+            element_fragment = ResultFragment(str(element))
+            job_info['contact_person'] = self._extract_contact_person_from_html(element_fragment)
+            job_info['contact_email'] = self._extract_contact_email_from_html(element_fragment)
             
-            return job_info if job_info['title'] else None
+            return JobPosting.from_dict(job_info) if job_info['title'] else None
             
         except Exception as e:
             print(f"Error extracting job from element: {e}")
@@ -645,7 +878,7 @@ class FinalJobindexScraper:
     def save_to_json(self, filename="final_jobindex_jobs.json"):
         """Save scraped jobs to JSON file"""
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.jobs, f, ensure_ascii=False, indent=2)
+            json.dump(self.jobs, f, ensure_ascii=False, indent=2, default=posting_json_default)
         print(f"Jobs saved to {filename}")
     
     def save_to_csv(self, filename="final_jobindex_jobs.csv"):
@@ -666,6 +899,9 @@ class FinalJobindexScraper:
                 'share_url': job.get('share_url', ''),
                 'salary': job.get('salary', ''),
                 'job_type': job.get('job_type', ''),
+                'salary_min': job.get('salary_min'),
+                'salary_max': job.get('salary_max'),
+                'salary_period': job.get('salary_period', ''),
                 'contact_person': job.get('contact_person', ''),
                 'contact_email': job.get('contact_email', ''),
                 'is_archived': job.get('is_archived', False),
@@ -678,6 +914,27 @@ class FinalJobindexScraper:
         df.to_csv(filename, index=False, encoding='utf-8')
         print(f"Jobs saved to {filename}")
     
+    def save_to_jsonl(self, prefix="final_jobindex_load", run_id=None):
+        """
+        Save scraped jobs as JSON Lines for the Snowflake loader's jsonl mode
+
+        Unlike the sink, which streams every posting as it is parsed, these are
+        the final jobs: filtered on 'data' and with detail-page emails attached.
+        """
+        with JsonlJobSink(prefix=prefix, run_id=run_id) as load_sink:
+            for job in self.jobs:
+                load_sink.write(job)
+        print(f"Jobs saved to {load_sink.pattern}")
+    
+    def save_to_parquet(self, filename="final_jobindex_jobs.parquet", batch_size=1000):
+        """Save scraped jobs to a typed Parquet file, one row group per batch_size jobs"""
+        from parquet_writer import ParquetJobWriter
+        
+        with ParquetJobWriter(filename, batch_size=batch_size) as writer:
+            for job in self.jobs:
+                writer.write(job)
+        print(f"Jobs saved to {filename}")
+    
     def print_summary(self):
         """Print a summary of scraped jobs"""
         print(f"\n=== FINAL JOB SCRAPING SUMMARY ===")
@@ -697,42 +954,91 @@ class FinalJobindexScraper:
                 print()
 
 
-def main():
-    """Main function to run the scraper"""
+# Inverted index over every posting seen, kept between runs for ad-hoc queries
+KEYWORD_INDEX_PATH = "keyword_index.json.gz"
+
+
+def load_search_terms(filename="search_terms.json"):
+    """Load (search_term, num_jobs) pairs from the search term config file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    default_num_jobs = config.get('default_num_jobs', 200)
+    return [
+        (entry['term'], entry.get('num_jobs', default_num_jobs))
+        for entry in config.get('terms', [])
+    ]
+
+
+def main(incremental=None, resume=None, http2=None, prefer_contact_emails=None):
+    """
+    Main function to run the scraper
+    
+    Args:
+        incremental (bool): Reuse postings unchanged since the last run from
+            scrape_state.sqlite instead of re-extracting and refetching them.
+            Defaults to the JOBINDEX_INCREMENTAL environment variable ("1").
+        resume (bool): Continue the most recent final_jobindex_jobs-*.jsonl run,
+            keeping the postings it already streamed. Defaults to JOBINDEX_RESUME ("1").
+        http2 (bool): Fetch over multiplexed HTTP/2 connections (needs httpx[http2]).
+            Defaults to JOBINDEX_HTTP2 ("1").
+        prefer_contact_emails (bool): Prefer contact/application/HR addresses over the
+            first email found. Defaults to JOBINDEX_PREFER_CONTACT_EMAIL ("1").
+    """
+    if incremental is None:
+        incremental = os.getenv('JOBINDEX_INCREMENTAL', '0') == '1'
+    if resume is None:
+        resume = os.getenv('JOBINDEX_RESUME', '0') == '1'
+    if http2 is None:
+        http2 = os.getenv('JOBINDEX_HTTP2', '0') == '1'
+    if prefer_contact_emails is None:
+        prefer_contact_emails = os.getenv('JOBINDEX_PREFER_CONTACT_EMAIL', '0') == '1'
     print("Starting Comprehensive Jobindex Scraper for ALL Jobs with 'data' and Contact Emails...")
     
-    # Initialize scraper
-    scraper = FinalJobindexScraper()
+    state_store = None
+    if incremental:
+        state_store = ScrapeStateStore()
+        expired = state_store.expire_past_last_date()
+        print(f"Incremental mode: marked {expired} postings past their last date as expired")
     
-    # Scrape jobs with "data" in the search term - no artificial limits
-    print("Scraping jobs with 'data' keyword (comprehensive search)...")
-    scraper.scrape_jobs(num_jobs=500, search_term="data")  # Increased limit
+    # Initialize scraper; detail pages fetched on earlier runs are reused from disk
+    # Every new posting is also streamed to JSONL as it is parsed, so a crash keeps what was scraped
+    sink = JsonlJobSink(run_id=latest_run_id() if resume else None)
+    scraper = FinalJobindexScraper(detail_cache=PageCache(), state_store=state_store, sink=sink, http2=http2,
+                                   prefer_contact_emails=prefer_contact_emails)
+    if resume:
+        print(f"Resumed {scraper.resume_from_sink()} postings from run {sink.run_id}")
     
-    # Also try related data terms - no artificial limits
-    data_terms = ["data analyst", "data scientist", "data engineer", "data science", "data analytics", "data processing", "data management", "data visualization", "data mining", "data warehouse", "dataanalytiker", "datascientist", "dataengineer"]
+    # Scrape every configured data term concurrently under the shared rate limit
+    search_terms = load_search_terms()
+    print(f"Scraping {len(search_terms)} search terms from search_terms.json (comprehensive search)...")
+    term_stats = scraper.scrape_terms_concurrently(search_terms)
+    sink.close()
+    print(f"Streamed {sink.records_written} postings to {sink.pattern}")
     
-    for term in data_terms:
-        print(f"Scraping jobs with search term: {term} (comprehensive search)")
-        scraper.scrape_jobs(num_jobs=200, search_term=term)  # Increased limit
+    print(f"\n=== SEARCH TERM STATISTICS ===")
+    for term, stats in term_stats.items():
+        print(f"  {term}: {stats['hits']} hits (of {stats['total_hits']}), "
+              f"{stats['overlap']} shared with other terms, {stats['unique_to_term']} unique")
     
-    # Remove duplicates based on TID
-    unique_jobs = {}
-    for job in scraper.jobs:
-        tid = job.get('tid', '')
-        if tid and tid not in unique_jobs:
-            unique_jobs[tid] = job
+    # scrape_jobs already deduplicates on TID; drop results that had no TID
+    unique_jobs = {tid: job for tid, job in scraper.job_index.items() if tid}
     
     print(f"Total unique jobs scraped: {len(unique_jobs)}")
+    for term, duplicates in scraper.duplicates_by_term.items():
+        print(f"  Duplicates skipped for '{term}': {duplicates}")
     
-    # Filter for jobs that contain "data" anywhere in title or description (case insensitive)
-    data_jobs = []
-    for job in unique_jobs.values():
-        title = job.get('title', '').lower()
-        description = job.get('description', '').lower()
-        
-        # Look for "data" anywhere in the text (including compound words)
-        if 'data' in title or 'data' in description:
-            data_jobs.append(job)
+    # Index titles and descriptions, on top of the index kept from earlier runs
+    keyword_index = KeywordIndex.load(KEYWORD_INDEX_PATH) if os.path.exists(KEYWORD_INDEX_PATH) else KeywordIndex()
+    keyword_index.add_postings(unique_jobs.values())
+    # Postings no longer listed are dropped, so the saved index does not grow run after run
+    removed = keyword_index.retain(unique_jobs)
+    print(f"Keyword index: {len(keyword_index)} postings, {removed} no longer listed removed")
+    keyword_index.save(KEYWORD_INDEX_PATH)
+    
+    # Jobs with "data" anywhere in title or description (case insensitive, including compound words)
+    data_tids = set(keyword_index.search('data'))
+    data_jobs = [job for tid, job in unique_jobs.items() if tid in data_tids]
     
     print(f"Found {len(data_jobs)} jobs containing 'data' keyword (including compound words)")
     
@@ -741,22 +1047,47 @@ def main():
     
     print(f"Checking {len(data_jobs)} data jobs for contact emails...")
     
-    for i, job in enumerate(data_jobs, 1):
-        print(f"Checking data job {i}/{len(data_jobs)}: {job.get('title', 'Unknown')}")
-        
-        job_url = job.get('url', '')
-        if job_url:
-            # Fetch detailed job description
-            contact_email = scraper._fetch_job_details(job_url)
-            if contact_email:
-                job['contact_email'] = contact_email
+    # Unchanged postings keep the detail-page result from the run that fetched them;
+    # those whose detail fetch never succeeded are fetched again, unless they have expired
+    detail_emails = {}
+    reused_tids = set()
+    for job in data_jobs:
+        if job.get('tid') in scraper.unchanged_tids:
+            previous = state_store.lookup(job['tid'])
+            if previous is None or (previous['detail_email'] is None and not previous['expired']):
+                continue
+            reused_tids.add(job['tid'])
+            if previous['detail_email']:
+                job['contact_email'] = previous['detail_email']
                 jobs_with_emails.append(job)
-                print(f"  ✅ Found email: {contact_email}")
-            else:
-                print(f"  ❌ No email found")
+    
+    # Fetch detail pages concurrently, paced at two requests per second per host
+    jobs_to_check = [job for job in data_jobs if job.get('url') and job.get('tid') not in reused_tids]
+    if scraper.unchanged_tids:
+        print(f"Skipping detail fetch for {len(data_jobs) - len(jobs_to_check)} unchanged data jobs")
+    details = scraper.fetch_job_details_concurrently(
+        [job['url'] for job in jobs_to_check], max_workers=8, requests_per_second=2.0
+    )
+    
+    for i, (job, detail) in enumerate(zip(jobs_to_check, details), 1):
+        print(f"Checking data job {i}/{len(jobs_to_check)}: {job.get('title', 'Unknown')} "
+              f"[{detail['status']}, {detail['elapsed']:.2f}s]")
         
-        # Small delay to be respectful
-        time.sleep(0.5)  # Reduced delay for faster processing
+        contact_email = detail['contact_email']
+        if not detail['error'] and (detail['status'] == 200 or detail['cache'] == 'revalidated'):
+            # Failed fetches are not recorded, so the next incremental run tries them again
+            detail_emails[job.get('tid')] = contact_email
+        if contact_email:
+            job['contact_email'] = contact_email
+            jobs_with_emails.append(job)
+            print(f"  ✅ Found email: {contact_email}")
+        else:
+            print(f"  ❌ No email found")
+    
+    # Remember what was extracted and fetched so the next incremental run can skip it
+    scraper.save_state(unique_jobs.values(), detail_emails)
+    if state_store:
+        state_store.close()
     
     # Update scraper jobs to only include data jobs with emails
     scraper.jobs = jobs_with_emails
@@ -764,6 +1095,8 @@ def main():
     # Save results
     scraper.save_to_json()
     scraper.save_to_csv()
+    scraper.save_to_jsonl(run_id=sink.run_id)
+    scraper.save_to_parquet()
     
     # Print summary
     scraper.print_summary()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport
+Shared requests session for the scrapers and the SEO analyzer: pooled
+connections sized for the concurrent modes, retries with jittered backoff on
+idempotent requests, a per-host circuit breaker and default browser headers
+
+Optionally (httpx with HTTP/2 support installed), an HTTP/2 session with the
+same interface multiplexes concurrent requests over one connection per host
+instead of opening a TCP+TLS connection per request in flight.
+"""
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # optional, only needed for the HTTP/2 transport
+    httpx = None
+
+
+# Browser-like headers every scraper used to set on its own session
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Cache-Control': 'max-age=0',
+}
+
+# Enough keep-alive connections per host for the widest concurrent mode
+# (8 detail workers plus 4 terms x 2 prefetched search pages)
+DEFAULT_POOL_MAXSIZE = 32
+
+# HTTP/1.1 connection headers that mean nothing on HTTP/2; dropped from HTTP/2 sessions
+HTTP1_ONLY_HEADERS = ('Connection', 'Keep-Alive', 'Upgrade-Insecure-Requests')
+
+# Server errors worth retrying; 429/503 are left to the adaptive rate limiter
+RETRY_STATUSES = (500, 502, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Per-host circuit breaker
+
+        After failure_threshold consecutive failures (connection errors or 5xx
+        after retries) a host's circuit opens and requests fail fast for
+        reset_timeout seconds; then one trial request is let through, and its
+        outcome closes the circuit again or reopens it.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def allow(self, host):
+        """True if a request to host may be sent now"""
+        with self.lock:
+            state = self.hosts.get(host)
+            if state is None or state['opened_at'] is None:
+                return True
+            if state['trial_in_flight'] or time.monotonic() - state['opened_at'] < self.reset_timeout:
+                return False
+            state['trial_in_flight'] = True
+            return True
+
+    def record_success(self, host):
+        with self.lock:
+            self.hosts[host] = {'failures': 0, 'opened_at': None, 'trial_in_flight': False}
+
+    def record_failure(self, host):
+        with self.lock:
+            state = self.hosts.setdefault(host, {'failures': 0, 'opened_at': None, 'trial_in_flight': False})
+            state['failures'] += 1
+            if state['trial_in_flight'] or state['failures'] >= self.failure_threshold:
+                if state['opened_at'] is None or state['trial_in_flight']:
+                    logging.warning(f"Circuit opened for {host} after {state['failures']} consecutive failures")
+                state['opened_at'] = time.monotonic()
+                state['trial_in_flight'] = False
+
+
+class ResilientAdapter(HTTPAdapter):
+    """HTTPAdapter that consults a CircuitBreaker around every request it sends"""
+
+    def __init__(self, breaker, **kwargs):
+        self.breaker = breaker
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Circuit open for {host}; not sending {request.method} {request.url}")
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.breaker.record_failure(host)
+            raise
+        if response.status_code >= 500 and response.status_code != 503:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+
+def make_retry(total=3, backoff_factor=0.5, backoff_jitter=0.5):
+    """Retry policy for idempotent requests: connection errors and RETRY_STATUSES, jittered exponential backoff"""
+    options = dict(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=backoff_jitter, **options)
+    except TypeError:
+        # urllib3 < 2 has no jitter option
+        return Retry(**options)
+
+
+def create_session(pool_maxsize=DEFAULT_POOL_MAXSIZE, retries=None, breaker=None, headers=None, adapter=None):
+    """
+    New requests.Session with the resilient adapter mounted for http and https
+
+    Args:
+        pool_maxsize (int): Keep-alive connections kept per host
+        retries (Retry): Retry policy, defaults to make_retry()
+        breaker (CircuitBreaker): Shared breaker, defaults to a new one
+        headers (dict): Headers set on top of requests' defaults instead of DEFAULT_HEADERS
+        adapter (ResilientAdapter): Mount this adapter, sharing its connection pool
+            and breaker, instead of a new one (pool_maxsize, retries and breaker are ignored)
+    """
+    session = requests.Session()
+    if adapter is None:
+        adapter = ResilientAdapter(
+            breaker or CircuitBreaker(),
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=retries or make_retry(),
+        )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS if headers is None else headers)
+    return session
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def shared_session(headers=None):
+    """
+    Process-wide session, so every scraper and the analyzer reuse one connection pool and breaker
+
+    A caller that sends its own headers gets a session of its own with those
+    headers (see create_session), still on the shared pool and breaker.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+    if headers is None:
+        return _shared_session
+    return create_session(headers=headers, adapter=_shared_session.get_adapter('https://'))
+
+
+def http2_available():
+    """True if httpx and its HTTP/2 support (the h2 package) are installed"""
+    if httpx is None:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Http2Session:
+    def __init__(self, max_connections=DEFAULT_POOL_MAXSIZE, retries=3, backoff_factor=0.5,
+                 backoff_jitter=0.5, breaker=None, headers=None, verify=True):
+        """
+        HTTP/2 session with the parts of the requests.Session interface the scrapers use
+
+        Wraps an httpx.Client with http2=True: all requests to a host share one
+        multiplexed connection, so concurrent fetches no longer need a TCP+TLS
+        handshake each. Requests to HTTP/1.1-only servers still work (ALPN falls
+        back). Mirrors create_session(): the same default headers, connection
+        retries, jittered backoff on RETRY_STATUSES and a per-host circuit breaker.
+
+        Args:
+            max_connections (int): Connection limit across hosts
+            retries (int): Retries for connection errors and RETRY_STATUSES
+            backoff_factor (float): Backoff base in seconds, doubled every retry
+            backoff_jitter (float): Random extra backoff, up to this many seconds
+            breaker (CircuitBreaker): Shared breaker, defaults to a new one
+            headers (dict): Headers to send instead of DEFAULT_HEADERS
+            verify: TLS verification, as for httpx (True, False or an ssl.SSLContext)
+        """
+        if not http2_available():
+            raise ImportError("The HTTP/2 transport needs httpx with HTTP/2 support: pip install 'httpx[http2]'")
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.breaker = breaker or CircuitBreaker()
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            transport=httpx.HTTPTransport(http2=True, retries=retries, limits=limits, verify=verify),
+        )
+        self.client.headers.update(DEFAULT_HEADERS if headers is None else headers)
+        for name in HTTP1_ONLY_HEADERS:
+            self.client.headers.pop(name, None)
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        """GET like requests.Session.get; the response has status_code, content, headers and raise_for_status()"""
+        host = urlparse(url).netloc
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Circuit open for {host}; not sending GET {url}")
+        try:
+            response = self._get_with_retries(
+                url, params=params, headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+        except Exception:
+            self.breaker.record_failure(host)
+            raise
+        if response.status_code >= 500 and response.status_code != 503:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+    def _get_with_retries(self, url, **kwargs):
+        # Connection errors are retried by the httpx transport, server errors here
+        for attempt in range(self.retries):
+            response = self.client.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            response.close()
+            time.sleep(self.backoff_factor * 2 ** attempt + random.uniform(0, self.backoff_jitter))
+        return self.client.get(url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+_shared_http2_session = None
+
+
+def shared_http2_session():
+    """Process-wide Http2Session, the HTTP/2 counterpart of shared_session()"""
+    global _shared_http2_session
+    with _shared_session_lock:
+        if _shared_http2_session is None:
+            _shared_http2_session = Http2Session()
+        return _shared_http2_session
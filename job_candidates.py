@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Job Candidates
+Single-pass collector of the elements on a parsed page that most likely hold
+one job listing each, for pages without a Stash search response
+
+Every element gets a score from the signals the robust scraper used to look
+for separately: one per job-ish class/attribute selector it matches and one
+per job, role, job-type or salary phrase in its own text. A selector-matched
+element is a listing container; it also scores one per kind of phrase found in
+the text it contains (up to the next nested container), and one if it links to
+exactly one job, as a single listing does. The best-scoring elements are
+returned, skipping any nested in or around one already chosen.
+"""
+
+import re
+
+from bs4 import CData, NavigableString, Tag
+
+
+# The CSS selectors of the original collector, checked on each tag as it is visited:
+# [class*="..."], [data-testid*="..."], article, .result and .search-result
+CLASS_SUBSTRINGS = ('job', 'stilling', 'position', 'listing', 'card', 'item')
+TESTID_SUBSTRINGS = ('job', 'listing')
+CONTAINER_TAGS = frozenset(['article'])
+CONTAINER_CLASSES = ('result', 'search-result')
+
+JOB_LINK_RE = re.compile(r'/job/|/stilling/|/position/|/vacancy/')
+
+# Page-level elements whose class or text says nothing about a single listing
+PAGE_TAGS = frozenset(['html', 'head', 'body', 'title', 'meta', 'script', 'style', 'template'])
+
+# Text phrases that mark an element as part of a listing, one signal each
+TEXT_SIGNAL_RES = [
+    re.compile(r'\b(job|stilling|position|vacancy|ansættelse)\b', re.IGNORECASE),
+    re.compile(r'\b(software|developer|engineer|analyst|manager)\b', re.IGNORECASE),
+    re.compile(r'\b(fuldtid|deltid|kontrakt|freelance)\b', re.IGNORECASE),
+    re.compile(r'\d+\.?\d*\s*(kr|dkk|kroner)', re.IGNORECASE),
+]
+
+
+def selector_signals(tag):
+    """Number of the original job selectors a tag matches"""
+    classes = tag.get('class') or []
+    class_value = ' '.join(classes) if isinstance(classes, list) else classes
+    signals = sum(1 for part in CLASS_SUBSTRINGS if part in class_value)
+    testid = tag.get('data-testid')
+    if testid:
+        signals += sum(1 for part in TESTID_SUBSTRINGS if part in testid)
+    if tag.name in CONTAINER_TAGS:
+        signals += 1
+    if classes:
+        signals += sum(1 for name in CONTAINER_CLASSES if name in classes)
+    return signals
+
+
+class JobCandidates:
+    def __init__(self, soup):
+        """
+        Score every element of a parsed page in one walk over the tree
+
+        Elements are tracked by identity (id()), never compared with ==, which
+        for bs4 tags means comparing whole subtrees.
+
+        Args:
+            soup (BeautifulSoup): The parsed page
+        """
+        # id(element) -> [element, score, document order]
+        self.scores = {}
+        # Job links in document order, for pages where no container yields a title
+        self.job_links = []
+        self.containers = 0
+        self._collect(soup)
+
+    def _credit(self, element, signals):
+        entry = self.scores.get(id(element))
+        if entry is None:
+            self.scores[id(element)] = [element, signals, len(self.scores)]
+        else:
+            entry[1] += signals
+
+    def _collect(self, soup):
+        # id(tag) -> nearest listing container at or above it; filled in document
+        # order, so a tag's parent is always looked up before the tag itself
+        container_of = {}
+        # id(container) -> (container, kinds of phrase in its text, job links in it)
+        contents = {}
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                container = container_of.get(id(node.parent))
+                signals = 0 if node.name in PAGE_TAGS else selector_signals(node)
+                if signals:
+                    self._credit(node, signals)
+                    self.containers += 1
+                    container = node
+                    contents[id(node)] = (node, set(), set())
+                container_of[id(node)] = container
+                if node.name == 'a' and JOB_LINK_RE.search(node.get('href') or ''):
+                    self.job_links.append(node)
+                    if container is not None:
+                        contents[id(container)][2].add(node['href'])
+            elif type(node) in (NavigableString, CData) and not node.isspace():
+                # Comments and the text of scripts and stylesheets are not listing text
+                parent = node.parent
+                if parent is None or parent.name in PAGE_TAGS:
+                    continue
+                kinds = [kind for kind, pattern in enumerate(TEXT_SIGNAL_RES) if pattern.search(node)]
+                if kinds:
+                    self._credit(parent, len(kinds))
+                    container = container_of.get(id(parent))
+                    if container is not None:
+                        contents[id(container)][1].update(kinds)
+
+        for container, kinds, links in contents.values():
+            self._credit(container, len(kinds) + (1 if len(links) == 1 else 0))
+
+    def __len__(self):
+        return len(self.scores)
+
+    def top(self, limit):
+        """
+        Up to limit best-scoring elements, ties in document order
+
+        An element inside or around one already chosen is skipped, so a
+        listing and its own heading are not both returned.
+        """
+        ranked = sorted(self.scores.values(), key=lambda entry: (-entry[1], entry[2]))
+        chosen = []
+        chosen_ids = set()
+        around_chosen = set()
+        for element, _, _ in ranked:
+            if len(chosen) >= limit:
+                break
+            if id(element) in around_chosen:
+                continue
+            ancestor_ids = [id(parent) for parent in element.parents]
+            if chosen_ids.intersection(ancestor_ids):
+                continue
+            chosen.append(element)
+            chosen_ids.add(id(element))
+            around_chosen.update(ancestor_ids)
+        return chosen
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Job Enrichment
+Batch post-processing that derives salary and job type from the result HTML
+of a whole page of postings at once, with vectorized pandas string
+operations instead of a loop of regex searches per posting.
+
+Salaries are normalized to numeric DKK amounts: "30.000 - 40.000 kr. pr.
+måned" gives salary_min 30000.0, salary_max 40000.0, salary_period 'month'.
+"""
+
+import pandas as pd
+
+
+# Job types in priority order; the first one found in a posting wins.
+# Same patterns as _extract_job_type_from_html, which tries them one by one.
+JOB_TYPE_PATTERNS = [
+    r'fuldtid|full.?time',
+    r'deltid|part.?time',
+    r'kontrakt|contract',
+    r'freelance|freelancer',
+    r'praktik|internship',
+    r'studiejob|student job',
+    r'graduate|trainee',
+]
+
+# Cheap pre-filter: only postings mentioning some job type go through the per-type extracts
+ANY_JOB_TYPE_PATTERN = r'\b(?:' + '|'.join(JOB_TYPE_PATTERNS) + r')\b'
+
+# Salaries are matched in the text with tags stripped, where only whitespace
+# and non-breaking spaces can separate the parts
+_TAG = r'<[^>]*>'
+_SPACE = r'(?:\s|&nbsp;|&#160;)'
+_GAP = _SPACE + '*'
+
+# Danish amounts: 35.000 / 35.000,50 / 35000 / 187,5. Starting with a bare \d
+# (rather than an alternation) lets re skip ahead to the next digit quickly.
+_AMOUNT = r'\d(?:\d{0,2}(?:\.\d{3})+|\d*)(?:,\d+)?'
+
+SALARY_PATTERN = (
+    r'(?P<text>'
+    rf'(?P<min>{_AMOUNT})'
+    rf'(?:{_GAP}(?:-|–|til){_GAP}(?P<max>{_AMOUNT}))?'
+    rf'{_GAP}(?:kr\.?|dkk|kroner)'
+    rf'(?:{_GAP}(?:pr\.?|per|om|/|i){_GAP}(?P<period>måneden|måned|mnd\.?|md\.?|timen|time|året|år)(?!\w))?'
+    r')'
+)
+
+# "Timeløn: 185 kr" - period named by the kind of pay rather than after the amount
+PAY_KIND_PATTERN = r'(måneds|time|års)løn'
+
+PERIODS = {
+    'måneden': 'month', 'måned': 'month', 'mnd': 'month', 'md': 'month',
+    'timen': 'hour', 'time': 'hour',
+    'året': 'year', 'år': 'year',
+    'måneds': 'month', 'års': 'year',
+}
+
+ENRICHED_FIELDS = ('salary', 'salary_min', 'salary_max', 'salary_period', 'job_type')
+
+
+def _to_dkk(amounts):
+    """'35.000,50' -> 35000.5 for a Series of matched amounts"""
+    amounts = amounts.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    return pd.to_numeric(amounts, errors='coerce')
+
+
+def extract_salary_and_job_type(html):
+    """
+    Salary and job type for a Series of result HTML, one row per posting
+
+    Returns a DataFrame with the index of html and the columns in
+    ENRICHED_FIELDS; salary is the matched text, '' when there is none, and
+    the numeric columns are NaN when no salary was found.
+    """
+    # Lowercased once up front: case-insensitive patterns are several times slower
+    html = html.fillna('').astype(str).str.lower()
+    text = html.str.replace(_TAG, ' ', regex=True)
+    enriched = pd.DataFrame(index=html.index, columns=list(ENRICHED_FIELDS))
+
+    salary = text.str.extract(SALARY_PATTERN)
+    found = salary['min'].notna()
+    enriched['salary'] = salary['text'].str.replace(_SPACE + '+', ' ', regex=True).fillna('')
+    enriched['salary_min'] = _to_dkk(salary['min'])
+    enriched['salary_max'] = _to_dkk(salary['max']).fillna(enriched['salary_min'])
+
+    period = salary['period'].str.rstrip('.').map(PERIODS)
+    pay_kind = text[found].str.extract(PAY_KIND_PATTERN)[0].map(PERIODS)
+    enriched['salary_period'] = period.fillna(pay_kind).where(found)
+
+    job_type = pd.Series('', index=html.index, dtype=object)
+    # Matched in the raw HTML, attributes included, like the original per-posting search
+    candidates = html[html.str.contains(ANY_JOB_TYPE_PATTERN, regex=True)]
+    for pattern in JOB_TYPE_PATTERNS:
+        if candidates.empty:
+            break
+        match = candidates.str.extract(rf'\b({pattern})\b')[0].dropna()
+        job_type.loc[match.index] = match.str.title()
+        candidates = candidates.drop(match.index)
+    enriched['job_type'] = job_type
+    return enriched
+
+
+def enrich_postings(postings, htmls):
+    """
+    Set salary, salary_min, salary_max, salary_period and job_type on a batch of postings
+
+    Args:
+        postings (list): Postings (JobPosting or dicts), updated in place
+        htmls (list): The result HTML each posting was parsed from, same order
+    """
+    if not postings:
+        return postings
+    enriched = extract_salary_and_job_type(pd.Series(htmls, dtype=object))
+    for posting, row in zip(postings, enriched.itertuples(index=False)):
+        posting['salary'] = row.salary
+        posting['salary_min'] = None if pd.isna(row.salary_min) else float(row.salary_min)
+        posting['salary_max'] = None if pd.isna(row.salary_max) else float(row.salary_max)
+        posting['salary_period'] = None if pd.isna(row.salary_period) else row.salary_period
+        posting['job_type'] = row.job_type
+    return postings
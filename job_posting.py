@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Job Posting
+Compact record type for scraped postings. Attributes live in __slots__
+instead of a per-posting dict and low-cardinality fields are interned, so
+hundreds of thousands of postings fit in a fraction of the memory. It keeps
+the dict interface the scrapers already use (get, [], in), so code written
+against posting dicts keeps working.
+"""
+
+import sys
+
+
+# Value of a field that was never set, so a field set to None still counts as present
+_UNSET = object()
+
+
+class JobPosting:
+    # Same keys, in the same order, as the dicts built by _parse_job_result
+    FIELDS = (
+        'tid', 'title', 'company', 'company_id', 'location', 'addresses', 'posted_date', 'last_date',
+        'description', 'url', 'share_url', 'rating', 'is_archived', 'is_local', 'scraped_at',
+        'company_url', 'company_logo', 'company_profile_url', 'salary', 'job_type',
+        'salary_min', 'salary_max', 'salary_period', 'contact_person', 'contact_email',
+    )
+
+    # Enum-like values repeated across many postings; one shared string object each
+    INTERNED_FIELDS = frozenset(('company', 'company_id', 'location', 'job_type', 'salary', 'salary_period', 'company_logo'))
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        """Create a posting; fields outside FIELDS are kept in self.extra"""
+        for name in self.FIELDS:
+            object.__setattr__(self, name, _UNSET)
+        self.extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, job):
+        """Build a posting from a scraper's posting dict"""
+        return cls(**job)
+
+    def to_dict(self):
+        """Posting dict with the scrapers' keys; unset fields are omitted, fields set to None are kept"""
+        job = {name: getattr(self, name) for name in self.FIELDS if getattr(self, name) is not _UNSET}
+        if self.extra:
+            job.update(self.extra)
+        return job
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            if key in self.INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key) is not _UNSET
+        return bool(self.extra) and key in self.extra
+
+    def __eq__(self, other):
+        if isinstance(other, JobPosting):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    # Postings are mutable and compare by content, so like dicts they are unhashable;
+    # key sets and dicts on the TID instead
+    __hash__ = None
+
+    def __repr__(self):
+        return f"JobPosting(tid={self.get('tid')!r}, title={self.get('title')!r}, company={self.get('company')!r})"
+
+
+def posting_json_default(obj):
+    """json.dump(s) default= hook that serializes JobPosting as its dict"""
+    if isinstance(obj, JobPosting):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
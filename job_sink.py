@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Job Sink
+Streams scraped postings to rotating JSON Lines files as they are parsed, so
+a crash keeps everything written so far and loaders can read the output in
+batches instead of holding the whole run in memory
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from job_posting import posting_json_default
+
+
+class JsonlJobSink:
+    def __init__(self, prefix="final_jobindex_jobs", directory=".", run_id=None, flush_every=50,
+                 flush_interval=5.0, max_records_per_file=5000):
+        """
+        Open a sink; nothing is created on disk until the first posting is written
+
+        Args:
+            prefix (str): File name prefix; files are named <prefix>-<run>-<part>.jsonl
+            directory (str): Directory the files are written to
+            run_id (str): Continue an earlier run (see latest_run_id) instead of starting a new one
+            flush_every (int): Flush after this many postings
+            flush_interval (float): ... or when this many seconds have passed since the last flush
+            max_records_per_file (int): Rotate to a new file after this many postings
+        """
+        self.prefix = prefix
+        self.directory = directory
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.max_records_per_file = max_records_per_file
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.lock = threading.Lock()
+        # A resumed run keeps its earlier parts and carries on with the next part number
+        self.paths = sorted(glob.glob(self.pattern))
+        self.records_written = 0
+        self._file = None
+        self._file_records = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def pattern(self):
+        """Glob matching every part written by this run"""
+        return run_pattern(self.prefix, self.run_id, self.directory)
+
+    def _open_next_file(self):
+        """Close the current file and start the next part; caller holds the lock"""
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{self.run_id}-{len(self.paths):04d}.jsonl")
+        self._file = open(path, 'a', encoding='utf-8')
+        self._file_records = 0
+        self.paths.append(path)
+
+    def _flush(self):
+        """Push buffered lines to the OS; caller holds the lock"""
+        if self._file is not None:
+            self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, job):
+        """Append one posting as a JSON line"""
+        line = json.dumps(job, ensure_ascii=False, default=posting_json_default) + '\n'
+        with self.lock:
+            if self._file is None or self._file_records >= self.max_records_per_file:
+                self._open_next_file()
+            self._file.write(line)
+            self._file_records += 1
+            self._unflushed += 1
+            self.records_written += 1
+            if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        """Flush buffered postings to disk"""
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        """Flush and close the current file"""
+        with self.lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_pattern(prefix, run_id, directory="."):
+    """Glob matching the parts of one run"""
+    return os.path.join(directory, f"{prefix}-{run_id}-*.jsonl")
+
+
+def latest_run_id(prefix="final_jobindex_jobs", directory="."):
+    """Run id of the most recent run with files on disk, or None"""
+    run_ids = set()
+    for path in glob.glob(os.path.join(directory, f"{prefix}-*-*.jsonl")):
+        name = os.path.basename(path)[len(prefix) + 1:-len('.jsonl')]
+        run_ids.add(name.rsplit('-', 1)[0])
+    return max(run_ids) if run_ids else None
+
+
+def iter_jsonl_jobs(pattern):
+    """
+    Yield postings one at a time from every JSONL file matching pattern, oldest first
+
+    A line cut short by a crash mid-write is skipped rather than failing the read.
+    """
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    print(f"Skipping truncated line in {path}")
+
+
+def iter_jsonl_batches(pattern, batch_size=5000):
+    """Yield lists of at most batch_size postings from the files matching pattern"""
+    batch = []
+    for job in iter_jsonl_jobs(pattern):
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
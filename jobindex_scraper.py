@@ -13,11 +13,14 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 
+from rate_limiter import shared_limiter
+
 
 class JobindexScraper:
     def __init__(self, headless=True):
@@ -39,6 +42,34 @@ class JobindexScraper:
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.wait = WebDriverWait(self.driver, 10)
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
+    
+    def _navigate(self, url, action=None):
+        """
+        Load url (or run action, e.g. a click that navigates) under the shared
+        limiter, feeding back how long the page took to load
+        """
+        self.limiter.acquire(url)
+        started = time.perf_counter()
+        try:
+            if action:
+                action()
+            else:
+                self.driver.get(url)
+        except Exception:
+            self.limiter.record(url, error=True, latency=time.perf_counter() - started)
+            raise
+        self.limiter.record(url, latency=time.perf_counter() - started)
+    
+    def _click_and_wait(self, element):
+        """Click an element that navigates and wait until the old page is gone"""
+        element.click()
+        try:
+            self.wait.until(EC.staleness_of(element))
+        except TimeoutException:
+            # Results replaced in place without a page load; the job card wait covers it
+            pass
     
     def scrape_jobs(self, num_jobs=10, search_term="", location=""):
         """
@@ -58,10 +89,8 @@ class JobindexScraper:
                 search_url += f"&location={location}"
             
             print(f"Searching for jobs at: {search_url}")
-            self.driver.get(search_url)
-            
-            # Wait for page to load
-            time.sleep(3)
+            # driver.get returns once the page has loaded; the job cards are waited for below
+            self._navigate(search_url)
             
             # Accept cookies if popup appears
             try:
@@ -69,7 +98,7 @@ class JobindexScraper:
                     EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Accepter alle') or contains(text(), 'Accept all')]"))
                 )
                 cookie_button.click()
-                time.sleep(2)
+                self.wait.until(EC.invisibility_of_element(cookie_button))
             except:
                 print("No cookie popup found or already accepted")
             
@@ -125,8 +154,7 @@ class JobindexScraper:
                     try:
                         next_button = self.driver.find_element(By.XPATH, "//a[contains(text(), 'Næste') or contains(text(), 'Next')]")
                         if next_button.is_enabled():
-                            next_button.click()
-                            time.sleep(3)
+                            self._navigate(self.driver.current_url, lambda: self._click_and_wait(next_button))
                             page += 1
                         else:
                             print("No more pages available")
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Keyword Index
+In-memory inverted index over posting titles and descriptions with boolean,
+prefix and compound-word queries, persisted to disk between runs
+
+Query syntax:
+    data                 postings with a word containing "data" (dataanalytiker, bigdata, data)
+    analy*               postings with a word starting with "analy"
+    "data"               postings with the exact word "data"
+    a b / a AND b        both;  a OR b  either;  NOT a / -a  exclude;  ( ... ) grouping
+
+A bare term matches the same postings as `term in (title + description).lower()`
+as long as it is a single word, which is how Danish compounds are caught.
+"""
+
+import bisect
+import gzip
+import json
+import re
+from collections import defaultdict
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+# Query tokens: quoted words, parentheses, a leading '-' for NOT, and words with an optional trailing '*'
+QUERY_TOKEN_RE = re.compile(r'"[^"]*"|\(|\)|-|[^\s()"-][^\s()"]*')
+
+NGRAM_SIZE = 3
+
+
+def tokenize(text):
+    """Lowercased words of a text"""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _ngrams(word):
+    return {word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)}
+
+
+class KeywordIndex:
+    def __init__(self):
+        """Create an empty index"""
+        self.keys = []                      # doc id -> posting key (TID)
+        self.doc_ids = {}                   # posting key -> doc id
+        self.doc_tokens = {}                # doc id -> tokens, so a changed posting can be re-indexed
+        self.postings = defaultdict(set)    # token -> doc ids
+        self._ngrams = defaultdict(set)     # character n-gram -> tokens, for substring lookups
+        self._vocabulary = None             # sorted tokens, for prefix lookups; rebuilt lazily
+        self._term_cache = {}
+        self._query_cache = {}
+
+    def __len__(self):
+        return len(self.doc_tokens)
+
+    def add(self, key, title="", description=""):
+        """Index (or re-index) one posting under key"""
+        doc_id = self.doc_ids.get(key)
+        if doc_id is None:
+            doc_id = len(self.keys)
+            self.keys.append(key)
+            self.doc_ids[key] = doc_id
+        else:
+            self._remove_doc(doc_id)
+
+        tokens = set(tokenize(title)) | set(tokenize(description))
+        self.doc_tokens[doc_id] = tokens
+        for token in tokens:
+            if token not in self.postings:
+                self._add_to_vocabulary(token)
+            self.postings[token].add(doc_id)
+        self._invalidate_caches()
+
+    def add_postings(self, jobs):
+        """Index postings (dicts or JobPosting) by TID; postings without one are skipped"""
+        for job in jobs:
+            if job.get('tid'):
+                self.add(job['tid'], job.get('title', ''), job.get('description', ''))
+
+    def remove(self, key):
+        """Drop a posting from the index"""
+        doc_id = self.doc_ids.pop(key, None)
+        if doc_id is not None:
+            self._remove_doc(doc_id)
+            self._invalidate_caches()
+
+    def retain(self, keys):
+        """Drop every posting whose key is not in keys (e.g. no longer listed); returns how many"""
+        keys = set(keys)
+        stale = [key for key in self.doc_ids if key not in keys]
+        for key in stale:
+            self.remove(key)
+        return len(stale)
+
+    def _invalidate_caches(self):
+        self._term_cache.clear()
+        self._query_cache.clear()
+
+    def _remove_doc(self, doc_id):
+        for token in self.doc_tokens.pop(doc_id, ()):
+            docs = self.postings[token]
+            docs.discard(doc_id)
+            if not docs:
+                del self.postings[token]
+                for gram in _ngrams(token):
+                    tokens = self._ngrams[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._ngrams[gram]
+                self._vocabulary = None
+
+    def _add_to_vocabulary(self, token):
+        for gram in _ngrams(token):
+            self._ngrams[gram].add(token)
+        self._vocabulary = None
+
+    def _tokens_with_prefix(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\U0010ffff')
+        return self._vocabulary[start:end]
+
+    def _tokens_containing(self, part):
+        """Vocabulary tokens with part as a substring, narrowed by n-grams before checking"""
+        if len(part) < NGRAM_SIZE:
+            return [token for token in self.postings if part in token]
+        candidates = None
+        for gram in _ngrams(part):
+            tokens = self._ngrams.get(gram, set())
+            candidates = tokens.copy() if candidates is None else candidates & tokens
+            if not candidates:
+                return []
+        return [token for token in candidates if part in token]
+
+    def _term_docs(self, term):
+        """Doc ids for one query term, cached until the index changes"""
+        docs = self._term_cache.get(term)
+        if docs is None:
+            if term.startswith('"'):
+                words = tokenize(term.strip('"'))
+                tokens = words[:1] if len(words) == 1 else []
+            elif term.endswith('*'):
+                tokens = self._tokens_with_prefix(term.rstrip('*').lower())
+            else:
+                tokens = self._tokens_containing(term.lower())
+            docs = set()
+            for token in tokens:
+                docs |= self.postings.get(token, set())
+            self._term_cache[term] = docs
+        return docs
+
+    def search(self, query):
+        """Keys of the postings matching a query, in the order they were first indexed"""
+        results = self._query_cache.get(query)
+        if results is None:
+            tokens = QUERY_TOKEN_RE.findall(query)
+            if not tokens:
+                return []
+            position, docs = self._parse_or(tokens, 0)
+            if position != len(tokens):
+                raise ValueError(f"Unexpected {tokens[position]!r} in query {query!r}")
+            results = [self.keys[doc_id] for doc_id in sorted(docs)]
+            self._query_cache[query] = results
+        return list(results)
+
+    def _parse_or(self, tokens, position):
+        position, docs = self._parse_and(tokens, position)
+        while position < len(tokens) and tokens[position] == 'OR':
+            position, right = self._parse_and(tokens, position + 1)
+            docs = docs | right
+        return position, docs
+
+    def _parse_and(self, tokens, position):
+        position, docs = self._parse_not(tokens, position)
+        while position < len(tokens) and tokens[position] not in ('OR', ')'):
+            if tokens[position] == 'AND':
+                position += 1
+            position, right = self._parse_not(tokens, position)
+            docs = docs & right
+        return position, docs
+
+    def _parse_not(self, tokens, position):
+        if position < len(tokens) and tokens[position] in ('NOT', '-'):
+            position, docs = self._parse_not(tokens, position + 1)
+            return position, set(self.doc_tokens) - docs
+        return self._parse_term(tokens, position)
+
+    def _parse_term(self, tokens, position):
+        if position >= len(tokens):
+            raise ValueError("Query ends where a term was expected")
+        token = tokens[position]
+        if token == '(':
+            position, docs = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            return position + 1, docs
+        if token in ('AND', 'OR', ')'):
+            raise ValueError(f"Unexpected {token!r} in query")
+        # Combined with non-mutating set operators only, so the cached set is safe to return
+        return position + 1, self._term_docs(token)
+
+    def save(self, path="keyword_index.json.gz"):
+        """Write the index to a gzipped JSON file; removed postings are left out and doc ids renumbered"""
+        live = sorted(self.doc_tokens)
+        payload = {
+            'keys': [self.keys[doc_id] for doc_id in live],
+            'docs': {str(new_id): sorted(self.doc_tokens[doc_id]) for new_id, doc_id in enumerate(live)},
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path="keyword_index.json.gz"):
+        """Read an index written by save()"""
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+
+        index = cls()
+        index.keys = payload['keys']
+        index.doc_ids = {key: doc_id for doc_id, key in enumerate(index.keys)}
+        for doc_id, tokens in payload['docs'].items():
+            doc_id = int(doc_id)
+            index.doc_tokens[doc_id] = set(tokens)
+            for token in tokens:
+                if token not in index.postings:
+                    index._add_to_vocabulary(token)
+                index.postings[token].add(doc_id)
+        return index
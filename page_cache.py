@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Page Cache
+Persistent SQLite cache for fetched job pages, with compressed bodies, TTL,
+conditional-GET validators and a size cap enforced by LRU eviction
+
+Pages are keyed on their URL without the per-search tracking parameters
+(jobsearchid, jobsearch_position), so a posting reached through another
+search or result position is still a hit.
+"""
+
+import sqlite3
+import threading
+import time
+import zlib
+
+from scrape_state import VOLATILE_PARAMS_RE
+
+
+def cache_key(url):
+    """The URL a page is stored under: url without its per-search tracking parameters"""
+    return VOLATILE_PARAMS_RE.sub(r'\1', url)
+
+
+class PageCache:
+    def __init__(self, path="job_detail_cache.sqlite", ttl_seconds=24 * 3600, max_bytes=200 * 1024 * 1024):
+        """
+        Open (or create) the cache
+
+        Args:
+            path (str): SQLite database file
+            ttl_seconds (int): How long a stored page is served without revalidation
+            max_bytes (int): Cap on the total compressed size; least recently used pages are evicted
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        """Return the cached entry for url as a dict (body, etag, last_modified, fetched_at), or None"""
+        url = cache_key(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+        return {
+            'body': zlib.decompress(row[0]),
+            'etag': row[1],
+            'last_modified': row[2],
+            'fetched_at': row[3],
+        }
+
+    def is_fresh(self, entry):
+        """True if the entry is younger than the TTL and can be used without revalidation"""
+        return time.time() - entry['fetched_at'] < self.ttl_seconds
+
+    def conditional_headers(self, entry):
+        """Validators for a conditional GET that revalidates the entry"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store a freshly fetched page and evict old pages if the cache is over its size cap"""
+        url = cache_key(url)
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, size, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, compressed, len(compressed), etag, last_modified, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def touch(self, url):
+        """Mark an entry as revalidated (e.g. after a 304) so its TTL starts over"""
+        url = cache_key(url)
+        now = time.time()
+        with self.lock:
+            self.conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.conn.commit()
+
+    def _evict(self):
+        """Delete least recently used pages until the total size is under max_bytes; caller holds the lock"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            self.conn.close()
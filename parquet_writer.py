@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Parquet Writer
+Writes scraped postings to a typed Parquet file with a fixed schema, one row
+group per batch, so loaders get dates, booleans and the nested addresses and
+rating fields without re-parsing and re-inferring a CSV
+"""
+
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+COORDINATES_TYPE = pa.struct([
+    pa.field('latitude', pa.float64()),
+    pa.field('longitude', pa.float64()),
+])
+
+ADDRESS_TYPE = pa.struct([
+    pa.field('id', pa.int64()),
+    pa.field('line', pa.string()),
+    pa.field('zipcode', pa.string()),
+    pa.field('city', pa.string()),
+    pa.field('simple_string', pa.string()),
+    pa.field('coordinates', COORDINATES_TYPE),
+])
+
+RATING_TYPE = pa.struct([
+    pa.field('ratings', pa.int64()),
+    pa.field('score', pa.float64()),
+])
+
+# One field per posting key; the flat ones match save_to_csv's columns
+JOB_PARQUET_SCHEMA = pa.schema([
+    pa.field('tid', pa.string()),
+    pa.field('title', pa.string()),
+    pa.field('company', pa.string()),
+    pa.field('company_id', pa.string()),
+    pa.field('location', pa.string()),
+    pa.field('addresses', pa.list_(ADDRESS_TYPE)),
+    pa.field('posted_date', pa.date32()),
+    pa.field('last_date', pa.date32()),
+    pa.field('description', pa.string()),
+    pa.field('url', pa.string()),
+    pa.field('share_url', pa.string()),
+    pa.field('rating', RATING_TYPE),
+    pa.field('salary', pa.string()),
+    pa.field('job_type', pa.string()),
+    pa.field('salary_min', pa.float64()),
+    pa.field('salary_max', pa.float64()),
+    pa.field('salary_period', pa.string()),
+    pa.field('contact_person', pa.string()),
+    pa.field('contact_email', pa.string()),
+    pa.field('is_archived', pa.bool_()),
+    pa.field('is_local', pa.bool_()),
+    pa.field('scraped_at', pa.timestamp('us')),
+    pa.field('company_url', pa.string()),
+    pa.field('company_logo', pa.string()),
+    pa.field('company_profile_url', pa.string()),
+])
+
+
+def _to_string(value):
+    """Strings as-is, numbers as text; empty values become null like an empty CSV cell"""
+    if value is None or value == '':
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_date(value):
+    """Date from a 'YYYY-MM-DD' (or longer ISO) string"""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _to_timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    return {'True': True, 'False': False, 'true': True, 'false': False}.get(value)
+
+
+def _to_address(address):
+    if not isinstance(address, dict):
+        return None
+    coordinates = address.get('coordinates')
+    return {
+        'id': _to_int(address.get('id')),
+        'line': _to_string(address.get('line')),
+        'zipcode': _to_string(address.get('zipcode')),
+        'city': _to_string(address.get('city')),
+        'simple_string': _to_string(address.get('simple_string')),
+        'coordinates': {
+            'latitude': _to_float(coordinates.get('latitude')),
+            'longitude': _to_float(coordinates.get('longitude')),
+        } if isinstance(coordinates, dict) else None,
+    }
+
+
+def _to_addresses(addresses):
+    if not isinstance(addresses, list):
+        return None
+    return [address for address in map(_to_address, addresses) if address is not None]
+
+
+def _to_rating(rating):
+    # Postings without ratings carry an empty dict
+    if not isinstance(rating, dict) or not rating:
+        return None
+    return {'ratings': _to_int(rating.get('ratings')), 'score': _to_float(rating.get('score'))}
+
+
+FIELD_CONVERTERS = {
+    'addresses': _to_addresses,
+    'posted_date': _to_date,
+    'last_date': _to_date,
+    'rating': _to_rating,
+    'salary_min': _to_float,
+    'salary_max': _to_float,
+    'is_archived': _to_bool,
+    'is_local': _to_bool,
+    'scraped_at': _to_timestamp,
+}
+
+
+def jobs_to_arrow(jobs):
+    """Convert posting dicts to a table with JOB_PARQUET_SCHEMA; keys outside the schema are dropped"""
+    columns = {}
+    for field in JOB_PARQUET_SCHEMA:
+        convert = FIELD_CONVERTERS.get(field.name, _to_string)
+        columns[field.name] = pa.array([convert(job.get(field.name)) for job in jobs], type=field.type)
+    return pa.Table.from_pydict(columns, schema=JOB_PARQUET_SCHEMA)
+
+
+class ParquetJobWriter:
+    def __init__(self, path, batch_size=1000, compression='zstd'):
+        """
+        Open a Parquet file for writing
+
+        Args:
+            path (str): Output file
+            batch_size (int): Postings buffered per row group
+            compression (str): Parquet codec passed to pyarrow
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer = []
+        self._writer = pq.ParquetWriter(path, JOB_PARQUET_SCHEMA, compression=compression)
+
+    def write(self, job):
+        """Buffer one posting, writing a row group once batch_size are buffered"""
+        self._buffer.append(job)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_batch(self, jobs):
+        """Write a list of postings as one row group"""
+        if jobs:
+            self._writer.write_table(jobs_to_arrow(jobs))
+            self.rows_written += len(jobs)
+
+    def flush(self):
+        """Write the buffered postings as a row group"""
+        self.write_batch(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Write any buffered postings and finalize the file footer"""
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Per-host token buckets used to pace concurrent requests to Jobindex.dk, and an
+adaptive (AIMD) variant that tunes each host's rate from response feedback
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize the bucket
+
+        Args:
+            rate (float): Tokens added per second (sustained requests per second)
+            capacity (float): Maximum burst size, defaults to one second of tokens
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate):
+        """Change the refill rate, keeping the tokens accrued at the old rate"""
+        with self.lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def pause(self, seconds):
+        """Hold back the next requests for the given number of seconds (e.g. Retry-After)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+    def reserve(self, tokens=1.0):
+        """Take tokens now, going into debt if needed, and return how long the caller must wait"""
+        with self.lock:
+            self._refill()
+            self.tokens -= tokens
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, tokens=1.0):
+        """Block until the requested number of tokens is available, then take them"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    def __init__(self, rate, capacity=None):
+        """Keep one TokenBucket per host, all with the same rate and burst size"""
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        """Return the bucket for the host of the given URL, creating it on first use"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.capacity)
+            return self.buckets[host]
+
+    def acquire(self, url):
+        """Block until a request to the URL's host is allowed"""
+        self.bucket_for(url).acquire()
+
+    def reserve(self, url):
+        """Reserve a request slot for the URL's host and return the delay before using it"""
+        return self.bucket_for(url).reserve()
+
+
+# Responses that mean the host wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+class AdaptiveRateLimiter(HostRateLimiter):
+    def __init__(self, rate=1.0, min_rate=0.2, max_rate=10.0, increase=0.5, decrease=0.5,
+                 latency_factor=2.0, latency_slack=0.25, capacity=None):
+        """
+        Per-host token buckets whose rate follows additive-increase/multiplicative-decrease
+
+        Every healthy response raises the host's rate so that it grows by about
+        `increase` requests per second for each second of traffic. A 429/503, a
+        connection error or latency above latency_factor times the host's
+        baseline (and at least latency_slack seconds over it, so jitter on a
+        fast host is ignored) multiplies the rate by `decrease`, at most once
+        per round trip, so a burst of throttled responses counts as one signal.
+
+        Args:
+            rate (float): Starting requests per second for a new host
+            min_rate (float): Floor the rate never drops below
+            max_rate (float): Ceiling the rate never grows above
+            increase (float): Additive increase, in requests per second per second
+            decrease (float): Multiplicative decrease factor on a throttle signal
+            latency_factor (float): Latency over baseline that counts as congestion
+            latency_slack (float): Seconds over baseline latency always tolerated
+            capacity (float): Burst size of each bucket
+        """
+        super().__init__(rate, capacity if capacity is not None else 1.0)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self.hosts = {}
+
+    def bucket_for(self, url):
+        """Return the bucket for the URL's host, creating it and its feedback state on first use"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.capacity)
+                self.hosts[host] = {'latency': None, 'baseline': None, 'last_decrease': 0.0}
+            return self.buckets[host]
+
+    def rate_for(self, url):
+        """Current requests per second allowed for the URL's host"""
+        return self.bucket_for(url).rate
+
+    def record(self, url, status=None, latency=None, error=False, retry_after=None):
+        """
+        Feed back the outcome of a request to the URL's host
+
+        Args:
+            status (int): HTTP status code, if a response arrived
+            latency (float): Seconds the request took
+            error (bool): The request failed without a response (timeout, reset)
+            retry_after (float): Seconds the server asked us to wait, if it said
+        """
+        bucket = self.bucket_for(url)
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        with self.lock:
+            state = self.hosts[host]
+            congested = False
+            if latency is not None:
+                # Fast-moving latency against a slow-moving baseline
+                state['latency'] = latency if state['latency'] is None else 0.3 * latency + 0.7 * state['latency']
+                state['baseline'] = latency if state['baseline'] is None else min(
+                    state['latency'], 0.02 * latency + 0.98 * state['baseline']
+                )
+                congested = state['latency'] > max(self.latency_factor * state['baseline'],
+                                                   state['baseline'] + self.latency_slack)
+
+            throttled = error or status in THROTTLE_STATUSES or congested
+            if throttled:
+                # One decrease per round trip, so a burst of 429s is treated as a single signal
+                if now - state['last_decrease'] < max(state['latency'] or 0.0, 1.0 / bucket.rate):
+                    new_rate = None
+                else:
+                    state['last_decrease'] = now
+                    new_rate = max(self.min_rate, bucket.rate * self.decrease)
+            elif status is None or status < 500:
+                new_rate = min(self.max_rate, bucket.rate + self.increase / bucket.rate)
+            else:
+                new_rate = None
+
+        if new_rate is not None:
+            bucket.set_rate(new_rate)
+        if retry_after:
+            bucket.pause(retry_after)
+
+
+def retry_after_seconds(response):
+    """Seconds from a response's Retry-After header, if it gives a number"""
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def paced_get(session, url, limiter, **kwargs):
+    """
+    session.get(url) paced by limiter (None means unpaced); an AdaptiveRateLimiter
+    also gets the status and latency back. Exceptions propagate after being recorded.
+    """
+    if limiter:
+        limiter.acquire(url)
+    started = time.perf_counter()
+    try:
+        response = session.get(url, **kwargs)
+    except Exception:
+        if isinstance(limiter, AdaptiveRateLimiter):
+            limiter.record(url, error=True, latency=time.perf_counter() - started)
+        raise
+    if isinstance(limiter, AdaptiveRateLimiter):
+        limiter.record(url, response.status_code, time.perf_counter() - started,
+                       retry_after=retry_after_seconds(response))
+    return response
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def shared_limiter():
+    """Process-wide AdaptiveRateLimiter, so every scraper shares per-host state"""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter()
+        return _shared_limiter
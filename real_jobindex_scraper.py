@@ -4,32 +4,33 @@ Real Jobindex Scraper
 Extracts actual job postings from Jobindex.dk by parsing embedded JSON data
 """
 
-import requests
 import json
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
 
+from description_extractor import extract_description
+from job_sink import JsonlJobSink
+from http_transport import shared_session
+from rate_limiter import paced_get, shared_limiter
+
 
 class RealJobindexScraper:
-    def __init__(self):
-        """Initialize the scraper"""
+    def __init__(self, sink=None):
+        """
+        Initialize the scraper
+        
+        Args:
+            sink (JsonlJobSink): Optional sink every new posting is streamed to as it is scraped
+        """
         self.base_url = "https://www.jobindex.dk"
         self.jobs = []
-        self.session = requests.Session()
-        
-        # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Cache-Control': 'max-age=0',
-        })
+        self.sink = sink
+        # Shared pooled session with retries, circuit breaker and default headers
+        self.session = shared_session()
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
     
     def scrape_jobs(self, num_jobs=10, search_term="", location=""):
         """
@@ -66,7 +67,7 @@ class RealJobindexScraper:
                         params['location'] = location
                     
                     # Make the request
-                    response = self.session.get(search_url, params=params, timeout=15)
+                    response = paced_get(self.session, search_url, self.limiter, params=params, timeout=15)
                     response.raise_for_status()
                     
                     # Parse the HTML
@@ -83,11 +84,11 @@ class RealJobindexScraper:
                         if not any(existing_job.get('tid') == job.get('tid') 
                                  for existing_job in self.jobs):
                             self.jobs.append(job)
+                            if self.sink:
+                                self.sink.write(job)
                             jobs_scraped += 1
                             print(f"Scraped job {jobs_scraped}: {job.get('headline', 'Unknown')} at {job.get('company', {}).get('name', 'Unknown')}")
                     
-                    time.sleep(2)  # Be respectful
-                    
                 except Exception as e:
                     print(f"Error scraping from {search_url}: {e}")
                     continue
@@ -186,29 +187,8 @@ class RealJobindexScraper:
     def _extract_description_from_html(self, html_content):
         """Extract job description from HTML content"""
         try:
-            if not html_content:
-                return ""
-            
-            # Parse HTML to extract text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up the text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Limit length
-            if len(text) > 500:
-                text = text[:500] + "..."
-            
-            return text
+            # Streamed from the raw HTML, stopping at 500 characters
+            return extract_description(html_content)
             
         except Exception as e:
             print(f"Error extracting description: {e}")
@@ -415,6 +395,15 @@ class RealJobindexScraper:
         df.to_csv(filename, index=False, encoding='utf-8')
         print(f"Jobs saved to {filename}")
     
+    def save_to_parquet(self, filename="real_jobindex_jobs.parquet", batch_size=1000):
+        """Save scraped jobs to a typed Parquet file, one row group per batch_size jobs"""
+        from parquet_writer import ParquetJobWriter
+        
+        with ParquetJobWriter(filename, batch_size=batch_size) as writer:
+            for job in self.jobs:
+                writer.write(job)
+        print(f"Jobs saved to {filename}")
+    
     def print_summary(self):
         """Print a summary of scraped jobs"""
         print(f"\n=== REAL JOB SCRAPING SUMMARY ===")
@@ -436,15 +425,17 @@ def main():
     """Main function to run the scraper"""
     print("Starting Real Jobindex Scraper...")
     
-    # Initialize scraper
-    scraper = RealJobindexScraper()
-    
-    # Scrape 10 jobs
-    scraper.scrape_jobs(num_jobs=10)
+    # Initialize scraper, streaming each posting to JSONL as it is scraped
+    with JsonlJobSink("real_jobindex_jobs") as sink:
+        scraper = RealJobindexScraper(sink=sink)
+        
+        # Scrape 10 jobs
+        scraper.scrape_jobs(num_jobs=10)
     
     # Save results
     scraper.save_to_json()
     scraper.save_to_csv()
+    scraper.save_to_parquet()
     
     # Print summary
     scraper.print_summary()
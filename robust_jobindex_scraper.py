@@ -4,25 +4,25 @@ Robust Jobindex Scraper
 Scrapes actual job postings from Jobindex.dk with better analysis of the site structure
 """
 
-import requests
 import json
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
 import urllib.parse
 
+from http_transport import shared_session
+from job_candidates import JobCandidates
+from rate_limiter import paced_get, shared_limiter
+
 
 class RobustJobindexScraper:
     def __init__(self):
         """Initialize the scraper"""
         self.base_url = "https://www.jobindex.dk"
         self.jobs = []
-        self.session = requests.Session()
-        
-        # Set headers to mimic a real browser
-        self.session.headers.update({
+        # Shared pool with retries and circuit breaker; headers that mimic a real browser
+        self.session = shared_session(headers={
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
@@ -35,6 +35,8 @@ class RobustJobindexScraper:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
         })
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
     
     def scrape_jobs(self, num_jobs=10, search_term="", location=""):
         """
@@ -78,8 +80,6 @@ class RobustJobindexScraper:
                             jobs_scraped += 1
                             print(f"Scraped job {jobs_scraped}: {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}")
                     
-                    time.sleep(2)  # Be respectful
-                    
                 except Exception as e:
                     print(f"Error with approach {approach.__name__}: {e}")
                     continue
@@ -116,7 +116,7 @@ class RobustJobindexScraper:
                     params['location'] = location
                 
                 # Make the request
-                response = self.session.get(search_url, params=params, timeout=15)
+                response = paced_get(self.session, search_url, self.limiter, params=params, timeout=15)
                 response.raise_for_status()
                 
                 # Parse the HTML
@@ -157,7 +157,7 @@ class RobustJobindexScraper:
                 category_url = f"{self.base_url}/job/{category}"
                 print(f"Trying category: {category_url}")
                 
-                response = self.session.get(category_url, timeout=15)
+                response = paced_get(self.session, category_url, self.limiter, timeout=15)
                 response.raise_for_status()
                 
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -165,7 +165,6 @@ class RobustJobindexScraper:
                 jobs.extend(page_jobs)
                 
                 print(f"Found {len(page_jobs)} jobs from category {category}")
-                time.sleep(1)
                 
             except Exception as e:
                 print(f"Error scraping category {category}: {e}")
@@ -181,7 +180,7 @@ class RobustJobindexScraper:
             recent_url = f"{self.base_url}/job/nyeste"
             print(f"Trying recent jobs: {recent_url}")
             
-            response = self.session.get(recent_url, timeout=15)
+            response = paced_get(self.session, recent_url, self.limiter, timeout=15)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -213,7 +212,7 @@ class RobustJobindexScraper:
                 company_url = f"{self.base_url}/company/{company}/jobs"
                 print(f"Trying company: {company_url}")
                 
-                response = self.session.get(company_url, timeout=15)
+                response = paced_get(self.session, company_url, self.limiter, timeout=15)
                 response.raise_for_status()
                 
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -221,7 +220,6 @@ class RobustJobindexScraper:
                 jobs.extend(page_jobs)
                 
                 print(f"Found {len(page_jobs)} jobs from company {company}")
-                time.sleep(1)
                 
             except Exception as e:
                 print(f"Error scraping company {company}: {e}")
@@ -236,59 +234,17 @@ class RobustJobindexScraper:
         # First, let's analyze the page structure
         print("Analyzing page structure...")
         
-        # Look for common job listing patterns
-        potential_job_elements = []
-        
-        # Method 1: Look for job-specific CSS classes
-        job_selectors = [
-            '[class*="job"]', '[class*="stilling"]', '[class*="position"]',
-            '[class*="listing"]', '[class*="card"]', '[class*="item"]',
-            '[data-testid*="job"]', '[data-testid*="listing"]',
-            'article', '.result', '.search-result'
-        ]
-        
-        for selector in job_selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"Found {len(elements)} elements with selector: {selector}")
-                potential_job_elements.extend(elements)
-        
-        # Method 2: Look for job links
-        job_links = soup.find_all('a', href=re.compile(r'/job/|/stilling/|/position/|/vacancy/'))
+        # One walk over the tree scores every element by its job-like signals
+        candidates = JobCandidates(soup)
+        job_links = candidates.job_links
+        print(f"Found {candidates.containers} elements matching job selectors")
         print(f"Found {len(job_links)} job links")
         
-        # Method 3: Look for elements containing job-related text
-        job_text_patterns = [
-            r'\b(job|stilling|position|vacancy|ansættelse)\b',
-            r'\b(software|developer|engineer|analyst|manager)\b',
-            r'\b(fuldtid|deltid|kontrakt|freelance)\b'
-        ]
-        
-        for pattern in job_text_patterns:
-            elements = soup.find_all(text=re.compile(pattern, re.IGNORECASE))
-            for element in elements:
-                if element.parent and element.parent not in potential_job_elements:
-                    potential_job_elements.append(element.parent)
-        
-        # Method 4: Look for salary information
-        salary_elements = soup.find_all(text=re.compile(r'\d+\.?\d*\s*(kr|dkk|kroner)', re.IGNORECASE))
-        for element in salary_elements:
-            if element.parent and element.parent not in potential_job_elements:
-                potential_job_elements.append(element.parent)
-        
-        # Remove duplicates and limit
-        unique_elements = []
-        seen = set()
-        for element in potential_job_elements:
-            element_id = id(element)
-            if element_id not in seen:
-                seen.add(element_id)
-                unique_elements.append(element)
-        
-        print(f"Found {len(unique_elements)} unique potential job elements")
+        top_elements = candidates.top(max_jobs)
+        print(f"Found {len(candidates)} unique potential job elements, using the top {len(top_elements)}")
         
         # Extract job data from elements
-        for element in unique_elements[:max_jobs]:
+        for element in top_elements:
             job_data = self._extract_job_data_from_element(element)
             if job_data and job_data.get('title'):
                 jobs.append(job_data)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Scrape State
+Small SQLite store of postings seen on earlier runs, so incremental scrapes
+only extract and fetch details for postings that are new or changed
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from job_posting import posting_json_default
+
+
+# Search-specific tracking parameters that change on every search without the posting changing
+VOLATILE_PARAMS_RE = re.compile(r'(jobsearchid|jobsearch_position)\W{1,2}\d+')
+
+# Stash result fields that define a posting's content
+HASHED_RESULT_FIELDS = ['tid', 'headline', 'area', 'firstdate', 'lastdate', 'share_url', 'is_archived', 'is_local']
+
+
+def posting_hash(result):
+    """Content hash of a Stash search result, ignoring per-search tracking parameters"""
+    company = result.get('company') if isinstance(result.get('company'), dict) else {}
+    payload = {field: result.get(field) for field in HASHED_RESULT_FIELDS}
+    payload['company'] = [company.get('id'), company.get('name')]
+    payload['html'] = VOLATILE_PARAMS_RE.sub(r'\1', result.get('html') or '')
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ScrapeStateStore:
+    def __init__(self, path="scrape_state.sqlite"):
+        """Open (or create) the state store"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                tid TEXT PRIMARY KEY,
+                last_date TEXT,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                detail_email TEXT,
+                job TEXT NOT NULL,
+                expired INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self.conn.commit()
+
+    def lookup(self, tid):
+        """
+        Return the stored state for a TID as a dict, or None if it has never been seen
+
+        detail_email is None when the detail page has not been fetched
+        successfully, and '' when it was fetched but had no email. expired is
+        True once the posting's last_date has passed (see expire_past_last_date).
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT last_date, content_hash, fetched_at, detail_email, job, expired FROM postings WHERE tid = ?",
+                (tid,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'last_date': row[0],
+            'content_hash': row[1],
+            'fetched_at': row[2],
+            'detail_email': row[3],
+            'job': json.loads(row[4]),
+            'expired': bool(row[5]),
+        }
+
+    def upsert(self, tid, content_hash, job, detail_email=None):
+        """Record a freshly extracted posting and, if it was fetched, the email found on its detail page"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO postings (tid, last_date, content_hash, fetched_at, detail_email, job, expired) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (tid, job.get('last_date') or None, content_hash, time.time(), detail_email,
+                 json.dumps(job, ensure_ascii=False, default=posting_json_default))
+            )
+            self.conn.commit()
+
+    def record_detail_email(self, tid, detail_email):
+        """Record the email from a successful detail fetch of a posting that is already stored"""
+        with self.lock:
+            self.conn.execute("UPDATE postings SET detail_email = ? WHERE tid = ?", (detail_email, tid))
+            self.conn.commit()
+
+    def expire_past_last_date(self, today=None):
+        """
+        Mark postings whose last_date has passed as expired, without refetching; returns how many
+
+        An expired posting that is still listed unchanged is reused from the
+        store and its detail page is not fetched again, even if the last fetch
+        failed. A changed posting (e.g. a new last_date) is stored afresh and
+        is no longer expired.
+        """
+        today = (today or date.today()).isoformat()
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE postings SET expired = 1 WHERE expired = 0 AND last_date IS NOT NULL AND last_date < ?",
+                (today,)
+            )
+            self.conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            self.conn.close()
@@ -4,24 +4,23 @@ Simple Jobindex Scraper
 Scrapes job postings from Jobindex.dk using requests and BeautifulSoup
 """
 
-import requests
 import json
 import pandas as pd
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import re
 
+from http_transport import shared_session
+from rate_limiter import paced_get, shared_limiter
+
 
 class SimpleJobindexScraper:
     def __init__(self):
         """Initialize the scraper"""
         self.base_url = "https://www.jobindex.dk"
         self.jobs = []
-        self.session = requests.Session()
-        
-        # Set headers to mimic a real browser
-        self.session.headers.update({
+        # Shared pool with retries and circuit breaker; headers that mimic a real browser
+        self.session = shared_session(headers={
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -29,6 +28,8 @@ class SimpleJobindexScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+        # Adaptive per-host pacing shared with every other scraper in the process
+        self.limiter = shared_limiter()
     
     def scrape_jobs(self, num_jobs=10, search_term="", location=""):
         """
@@ -53,7 +54,7 @@ class SimpleJobindexScraper:
                 print(f"Search parameters: {params}")
             
             # Make the request
-            response = self.session.get(search_url, params=params)
+            response = paced_get(self.session, search_url, self.limiter, params=params)
             response.raise_for_status()
             
             # Parse the HTML
@@ -123,11 +124,10 @@ class SimpleJobindexScraper:
                     next_url = self._find_next_page(soup)
                     if next_url:
                         print(f"Going to next page: {next_url}")
-                        response = self.session.get(next_url)
+                        response = paced_get(self.session, next_url, self.limiter)
                         response.raise_for_status()
                         soup = BeautifulSoup(response.content, 'html.parser')
                         page += 1
-                        time.sleep(2)  # Be respectful with delays
                     else:
                         print("No next page found")
                         break
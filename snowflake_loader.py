@@ -3,19 +3,146 @@ import pandas as pd
 import os
 from datetime import datetime
 import json
+import hashlib
+import queue
+import threading
+import shutil
+import tempfile
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from job_sink import iter_jsonl_batches, latest_run_id, run_pattern
+
+# Insert column order; CONTENT_HASH lets incremental loads detect changed postings
+JOB_COLUMNS = [
+    'TID', 'TITLE', 'COMPANY', 'COMPANY_ID', 'CONTACT_EMAIL', 'CONTACT_PERSON', 'LOCATION', 'POSTED_DATE', 'LAST_DATE',
+    'DESCRIPTION', 'URL', 'SHARE_URL', 'SALARY', 'JOB_TYPE', 'IS_ARCHIVED', 'IS_LOCAL', 'SCRAPED_AT', 'CONTENT_HASH'
+]
+
+
+
+def insert_sql_for(table_name):
+    """Parameterised INSERT of a JOB_COLUMNS record into table_name"""
+    return f"""
+INSERT INTO {table_name} (
+    {', '.join(JOB_COLUMNS)}
+) VALUES ({', '.join(['%s'] * len(JOB_COLUMNS))})
+"""
+
+
+INSERT_SQL = insert_sql_for('JOBPOSTINGSSCRAPED')
+
+# Flat posting fields, as written by save_to_csv and JsonlJobSink
+CSV_FIELDS = [column.lower() for column in JOB_COLUMNS[:-1]]
+
+# Free-text CSV columns are read as strings: left to type inference, IDs like
+# company_id would become float64 when any value is empty ('123' -> '123.0')
+CSV_DTYPES = {
+    field: str for field in CSV_FIELDS
+    if field not in ('posted_date', 'last_date', 'is_archived', 'is_local', 'scraped_at')
+}
+
+# Max TIDs per IN (...) list when archiving postings that disappeared
+ARCHIVE_BATCH_SIZE = 1000
+
+# Snowflake error codes for statements that timed out in the warehouse queue
+QUEUED_STATEMENT_ERRNOS = {625, 630}
+
+
+def content_hash(record):
+    """Hash the posting fields of a record, ignoring SCRAPED_AT which changes every run"""
+    payload = '\x1f'.join('' if value is None else str(value) for value in record[:16])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def records_checksum(records):
+    """Order-independent checksum matching checksum_sql_for: sum of the first 60 bits of each CONTENT_HASH"""
+    return sum(int(record[-1][:15], 16) for record in records)
+
+
+def checksum_sql_for(table_name):
+    """Row count and records_checksum of table_name, computed in the warehouse"""
+    return f"""
+SELECT COUNT(*), COALESCE(SUM(TO_NUMBER(SUBSTR(CONTENT_HASH, 1, 15), 'XXXXXXXXXXXXXXX')), 0)
+FROM {table_name}
+"""
+
+
+# Snowflake casts applied to each Parquet field when copying into JOBPOSTINGSSCRAPED
+PARQUET_COLUMN_CASTS = {
+    'POSTED_DATE': 'DATE',
+    'LAST_DATE': 'DATE',
+    'IS_ARCHIVED': 'BOOLEAN',
+    'IS_LOCAL': 'BOOLEAN',
+    'SCRAPED_AT': 'TIMESTAMP_NTZ',
+}
+
+
+class TableStage:
+    """Snowflake table stage (@%TABLE) used by the Parquet bulk load path"""
+    
+    def __init__(self, cursor, table='JOBPOSTINGSSCRAPED'):
+        self.cursor = cursor
+        self.table = table
+    
+    def put(self, local_path):
+        """Upload a local file to the stage and return its staged name"""
+        self.cursor.execute(f"PUT 'file://{os.path.abspath(local_path)}' @%{self.table} AUTO_COMPRESS=FALSE OVERWRITE=TRUE")
+        return os.path.basename(local_path)
+    
+    def copy_into(self, staged_name, columns):
+        """COPY a staged Parquet file into the table, mapping fields by name; returns rows loaded"""
+        select_list = ', '.join(
+            f"$1:{column}::{PARQUET_COLUMN_CASTS.get(column, 'VARCHAR')}" for column in columns
+        )
+        self.cursor.execute(f"""
+            COPY INTO {self.table} ({', '.join(columns)})
+            FROM (SELECT {select_list} FROM @%{self.table})
+            FILES = ('{staged_name}')
+            FILE_FORMAT = (TYPE = PARQUET)
+            PURGE = TRUE
+        """)
+        # One result row per file: (file, status, rows_parsed, rows_loaded, ...)
+        return sum(row[3] for row in self.cursor.fetchall())
+
+
+class DirectoryStage:
+    """Local directory stand-in for TableStage, for exercising the Parquet path without Snowflake"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def put(self, local_path):
+        """Copy a local file into the stage directory and return its staged name"""
+        shutil.copy(local_path, self.directory)
+        return os.path.basename(local_path)
+    
+    def copy_into(self, staged_name, columns):
+        """Return the row count of the staged file, as COPY INTO would report it"""
+        import pyarrow.parquet as pq
+        
+        metadata = pq.read_metadata(os.path.join(self.directory, staged_name))
+        missing = [column for column in columns if column not in metadata.schema.names]
+        if missing:
+            raise ValueError(f"Staged file is missing columns: {missing}")
+        return metadata.num_rows
+
 
 class SnowflakeJobLoader:
     def __init__(self):
         """Initialize Snowflake connection using credentials from get_players.py"""
         # Use the credentials found in get_players.py
-        self.conn = snowflake.connector.connect(
-            user='mollerhoj',
-            password='Mollerhoj12344!',
-            account='iooooic-wm88724',
-            warehouse='COMPUTE_WH',
-            database='JOBPOSTINGS',  # We'll create this new database
-            schema='JOBPOSTINGS'     # We'll create this new schema
-        )
+        self.connection_params = {
+            'user': 'mollerhoj',
+            'password': 'Mollerhoj12344!',
+            'account': 'iooooic-wm88724',
+            'warehouse': 'COMPUTE_WH',
+            'database': 'JOBPOSTINGS',  # We'll create this new database
+            'schema': 'JOBPOSTINGS'     # We'll create this new schema
+        }
+        self.conn = snowflake.connector.connect(**self.connection_params)
         self.cursor = self.conn.cursor()
         print("✅ Connected to Snowflake using credentials from get_players.py")
         
@@ -54,11 +181,11 @@ class SnowflakeJobLoader:
             print(f"❌ Error recreating table: {e}")
             raise
 
-    def create_table(self):
+    def create_table(self, table_name='JOBPOSTINGSSCRAPED'):
         """Create the jobpostingscraped table"""
         try:
-            create_table_sql = """
-            CREATE TABLE IF NOT EXISTS JOBPOSTINGSSCRAPED (
+            create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
                 TID VARCHAR(50),
                 TITLE VARCHAR(500),
                 COMPANY VARCHAR(200),
@@ -76,113 +203,616 @@ class SnowflakeJobLoader:
                 IS_ARCHIVED BOOLEAN,
                 IS_LOCAL BOOLEAN,
                 SCRAPED_AT TIMESTAMP_NTZ,
+                CONTENT_HASH VARCHAR(64),
                 LOADED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
             )
             """
             self.cursor.execute(create_table_sql)
-            print("✅ Table JOBPOSTINGSSCRAPED created/verified")
+            print(f"✅ Table {table_name} created/verified")
             
         except Exception as e:
             print(f"❌ Error creating table: {e}")
             raise
     
+    def _prepare_dataframe(self, df):
+        """Coerce CSV columns to the types expected by JOBPOSTINGSSCRAPED"""
+        # Convert date columns - handle both string and datetime formats
+        try:
+            df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce').dt.date
+        except:
+            df['posted_date'] = None
+            
+        try:
+            df['last_date'] = pd.to_datetime(df['last_date'], errors='coerce').dt.date
+        except:
+            df['last_date'] = None
+            
+        try:
+            df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
+        except:
+            df['scraped_at'] = None
+        
+        # Convert boolean columns
+        df['is_archived'] = df['is_archived'].map({'True': True, 'False': False, True: True, False: False})
+        df['is_local'] = df['is_local'].map({'True': True, 'False': False, True: True, False: False})
+        
+        # Replace NaN values with None
+        df = df.replace({pd.NA: None, pd.NaT: None})
+        df = df.where(pd.notnull(df), None)
+        return df
+    
+    def _build_records(self, df):
+        """Turn a prepared DataFrame into insert tuples ordered like JOB_COLUMNS"""
+        # Handle NaN values in each field
+        def clean_value(val):
+            if pd.isna(val) or val == 'nan' or val == 'NAN':
+                return None
+            return val
+        
+        records = []
+        for _, row in df.iterrows():
+            # Convert timestamp to string if it exists
+            scraped_at = row.get('scraped_at')
+            if scraped_at is not None and pd.notna(scraped_at):
+                scraped_at = scraped_at.strftime('%Y-%m-%d %H:%M:%S')
+            else:
+                scraped_at = None
+            
+            record = (
+                clean_value(row.get('tid', '')),
+                clean_value(row.get('title', '')),
+                clean_value(row.get('company', '')),
+                clean_value(row.get('company_id', '')),
+                clean_value(row.get('contact_email', '')),
+                clean_value(row.get('contact_person', '')),
+                clean_value(row.get('location', '')),
+                clean_value(row.get('posted_date')),
+                clean_value(row.get('last_date')),
+                clean_value(row.get('description', '')),
+                clean_value(row.get('url', '')),
+                clean_value(row.get('share_url', '')),
+                clean_value(row.get('salary', '')),
+                clean_value(row.get('job_type', '')),
+                clean_value(row.get('is_archived')),
+                clean_value(row.get('is_local')),
+                scraped_at
+            )
+            records.append(record + (content_hash(record),))
+        
+        return records
+    
     def load_data_from_csv(self, csv_file_path):
         """Load data from CSV file into Snowflake"""
         try:
             # Read CSV file
-            df = pd.read_csv(csv_file_path)
+            df = pd.read_csv(csv_file_path, dtype=CSV_DTYPES)
             print(f"📊 Loaded {len(df)} records from CSV")
             
-            # Convert date columns - handle both string and datetime formats
+            start_time = time.perf_counter()
+            
+            # Prepare data for insertion
+            df = self._prepare_dataframe(df)
+            records = self._build_records(df)
+            
+            # Insert data
+            self.cursor.executemany(INSERT_SQL, records)
+            self.conn.commit()
+            
+            elapsed = time.perf_counter() - start_time
+            print(f"✅ Successfully loaded {len(records)} records into Snowflake "
+                  f"(executemany: {len(records) / max(elapsed, 1e-9):.0f} rows/s)")
+            
+        except Exception as e:
+            print(f"❌ Error loading data: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def _iter_record_chunks(self, csv_file_path, chunk_size):
+        """Yield converted record lists, reading at most chunk_size CSV rows at a time"""
+        for df in pd.read_csv(csv_file_path, dtype=CSV_DTYPES, chunksize=chunk_size):
+            yield self._build_records(self._prepare_dataframe(df))
+    
+    def _iter_jsonl_record_chunks(self, jsonl_pattern, chunk_size):
+        """Yield converted record lists, reading at most chunk_size JSONL postings at a time"""
+        for batch in iter_jsonl_batches(jsonl_pattern, chunk_size):
+            # Postings may omit fields; selecting the CSV columns fills them with NaN.
+            # object keeps JSON values as they are, so an integer company_id is not widened to float
+            df = pd.DataFrame(batch, columns=CSV_FIELDS, dtype=object)
+            yield self._build_records(self._prepare_dataframe(df))
+    
+    def load_data_from_csv_chunked(self, csv_file_path, chunk_size=5000, commit_every=1):
+        """
+        Stream the CSV into Snowflake chunk by chunk
+        
+        A reader thread parses and converts the next chunk while the current one
+        is being sent, and the queue between them holds a single chunk, so peak
+        memory is bounded by a few chunks regardless of the export size.
+        
+        Args:
+            csv_file_path (str): CSV export to load
+            chunk_size (int): Rows read, converted and inserted per chunk
+            commit_every (int): Commit after this many chunks (0 = once at the end)
+        
+        Returns:
+            int: Number of records loaded
+        """
+        return self._load_record_chunks(self._iter_record_chunks(csv_file_path, chunk_size), commit_every)
+    
+    def load_data_from_jsonl(self, jsonl_pattern, chunk_size=5000, commit_every=1):
+        """
+        Stream postings written by JsonlJobSink into Snowflake chunk by chunk
+        
+        Same pipeline as load_data_from_csv_chunked, reading the JSONL parts
+        matching jsonl_pattern in order; lines truncated by a crash are skipped.
+        The parts should hold the same jobs as the CSV export (the scraper's
+        save_to_jsonl), since the table is replaced with exactly these.
+        
+        Returns:
+            int: Number of records loaded
+        """
+        return self._load_record_chunks(self._iter_jsonl_record_chunks(jsonl_pattern, chunk_size), commit_every)
+    
+    def _load_record_chunks(self, record_chunks, commit_every):
+        """Insert record lists from a generator, converting the next one on a reader thread"""
+        chunks = queue.Queue(maxsize=1)
+        done = object()
+        # Set when the load stops early, so the reader stops parsing further chunks
+        stop = threading.Event()
+        
+        def reader():
             try:
-                df['posted_date'] = pd.to_datetime(df['posted_date'], errors='coerce').dt.date
-            except:
-                df['posted_date'] = None
+                for records in record_chunks:
+                    if stop.is_set():
+                        break
+                    chunks.put(records)
+                else:
+                    chunks.put(done)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                record_chunks.close()
+        
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+        
+        total = 0
+        chunk_count = 0
+        try:
+            self.cursor.execute("BEGIN")
+            while True:
+                records = chunks.get()
+                if records is done:
+                    break
+                if isinstance(records, Exception):
+                    raise records
                 
-            try:
-                df['last_date'] = pd.to_datetime(df['last_date'], errors='coerce').dt.date
-            except:
-                df['last_date'] = None
+                if records:
+                    self.cursor.executemany(INSERT_SQL, records)
+                total += len(records)
+                chunk_count += 1
+                print(f"📦 Chunk {chunk_count}: sent {len(records)} records ({total} total)")
                 
-            try:
-                df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
-            except:
-                df['scraped_at'] = None
+                if commit_every and chunk_count % commit_every == 0:
+                    self.cursor.execute("COMMIT")
+                    self.cursor.execute("BEGIN")
             
-            # Convert boolean columns
-            df['is_archived'] = df['is_archived'].map({'True': True, 'False': False, True: True, False: False})
-            df['is_local'] = df['is_local'].map({'True': True, 'False': False, True: True, False: False})
+            self.cursor.execute("COMMIT")
+            print(f"✅ Successfully loaded {total} records into Snowflake in {chunk_count} chunks")
+            return total
             
-            # Replace NaN values with None
-            df = df.replace({pd.NA: None, pd.NaT: None})
-            df = df.where(pd.notnull(df), None)
+        except Exception as e:
+            self.cursor.execute("ROLLBACK")
+            print(f"❌ Error loading data in chunks: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+        finally:
+            # Tell the reader to stop, unblock it if it is waiting on the full queue, then wait for it
+            stop.set()
+            while reader_thread.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader_thread.join()
+    
+    def _records_to_arrow(self, records):
+        """Build a typed Arrow table (one column per JOB_COLUMNS entry) from insert tuples"""
+        import pyarrow as pa
+        
+        schema = pa.schema([
+            pa.field(column, {
+                'POSTED_DATE': pa.date32(),
+                'LAST_DATE': pa.date32(),
+                'IS_ARCHIVED': pa.bool_(),
+                'IS_LOCAL': pa.bool_(),
+                'SCRAPED_AT': pa.timestamp('s'),
+            }.get(column, pa.string()))
+            for column in JOB_COLUMNS
+        ])
+        
+        columns = {}
+        for index, field in enumerate(schema):
+            values = [record[index] for record in records]
+            if field.name == 'SCRAPED_AT':
+                values = [datetime.strptime(v, '%Y-%m-%d %H:%M:%S') if v else None for v in values]
+            elif pa.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            columns[field.name] = pa.array(values, type=field.type)
+        
+        return pa.Table.from_pydict(columns, schema=schema)
+    
+    def load_data_from_csv_parquet(self, csv_file_path, stage=None, compression='zstd'):
+        """
+        Bulk load the CSV through a compressed Parquet file and COPY INTO
+        
+        The records are converted to a typed Arrow table, written as Parquet,
+        uploaded to the table stage and copied into JOBPOSTINGSSCRAPED in a
+        single statement instead of row-by-row parameter binding.
+        
+        Args:
+            csv_file_path (str): CSV export to load
+            stage: TableStage (default) or DirectoryStage for local runs
+            compression (str): Parquet codec passed to pyarrow
+        
+        Returns:
+            int: Number of rows reported loaded by the stage
+        """
+        try:
+            df = pd.read_csv(csv_file_path, dtype=CSV_DTYPES)
+            print(f"📊 Loaded {len(df)} records from CSV")
             
-            # Prepare data for insertion
+            start_time = time.perf_counter()
+            record_chunks = [self._build_records(self._prepare_dataframe(df))]
+            return self._copy_record_chunks(record_chunks, stage, compression, start_time)
+            
+        except Exception as e:
+            print(f"❌ Error loading data via Parquet: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def _iter_parquet_record_chunks(self, parquet_file_path):
+        """Yield one record list per row group of a ParquetJobWriter file, without pandas"""
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(parquet_file_path)
+        for index in range(parquet_file.num_row_groups):
             records = []
-            for _, row in df.iterrows():
-                # Convert timestamp to string if it exists
-                scraped_at = row.get('scraped_at')
-                if scraped_at is not None and pd.notna(scraped_at):
-                    scraped_at = scraped_at.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    scraped_at = None
+            for row in parquet_file.read_row_group(index, columns=CSV_FIELDS).to_pylist():
+                # Values are already typed; only SCRAPED_AT is formatted the way _build_records does
+                scraped_at = row['scraped_at']
+                record = tuple(row[field] for field in CSV_FIELDS[:-1]) + (
+                    scraped_at.strftime('%Y-%m-%d %H:%M:%S') if scraped_at else None,
+                )
+                records.append(record + (content_hash(record),))
+            yield records
+    
+    def load_data_from_parquet(self, parquet_file_path, stage=None, compression='zstd'):
+        """
+        Bulk load a scraper's typed Parquet export (save_to_parquet) via COPY INTO
+        
+        Row groups are read already typed, so there is no CSV parse or type
+        inference; records match the CSV path's (which reads text columns as
+        strings), CONTENT_HASH included. verify_export_parity.py checks this.
+        
+        Args:
+            parquet_file_path (str): File written by ParquetJobWriter
+            stage: TableStage (default) or DirectoryStage for local runs
+            compression (str): Parquet codec passed to pyarrow
+        
+        Returns:
+            int: Number of rows reported loaded by the stage
+        """
+        try:
+            start_time = time.perf_counter()
+            return self._copy_record_chunks(
+                self._iter_parquet_record_chunks(parquet_file_path), stage, compression, start_time
+            )
+            
+        except Exception as e:
+            print(f"❌ Error loading Parquet export: {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def _copy_record_chunks(self, record_chunks, stage, compression, start_time):
+        """Write record lists as row groups of one staged Parquet file and COPY it into the table"""
+        import pyarrow.parquet as pq
+        
+        stage = stage or TableStage(self.cursor)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_path = os.path.join(tmp_dir, f"jobpostings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet")
+            writer = None
+            for records in record_chunks:
+                table = self._records_to_arrow(records)
+                if writer is None:
+                    writer = pq.ParquetWriter(parquet_path, table.schema, compression=compression)
+                writer.write_table(table)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, self._records_to_arrow([]).schema, compression=compression)
+            writer.close()
+            staged_name = stage.put(parquet_path)
+        
+        rows_loaded = stage.copy_into(staged_name, JOB_COLUMNS)
+        elapsed = time.perf_counter() - start_time
+        
+        print(f"✅ Successfully loaded {rows_loaded} records into Snowflake "
+              f"(parquet COPY: {rows_loaded / max(elapsed, 1e-9):.0f} rows/s)")
+        return rows_loaded
+    
+    def _is_queued_error(self, error):
+        """True if Snowflake rejected a statement because the warehouse queue was saturated"""
+        errno = getattr(error, 'errno', None)
+        return errno in QUEUED_STATEMENT_ERRNOS or 'queued' in str(error).lower()
+    
+    def _upload_partition(self, partition_id, records, max_retries, queued_timeout, insert_sql=INSERT_SQL):
+        """Insert one partition over its own connection and transaction, backing off while the warehouse is queued"""
+        for attempt in range(max_retries + 1):
+            conn = snowflake.connector.connect(**self.connection_params)
+            cursor = conn.cursor()
+            try:
+                # Fail fast instead of sitting in the queue so we can back off and retry
+                cursor.execute(f"ALTER SESSION SET STATEMENT_QUEUED_TIMEOUT_IN_SECONDS = {queued_timeout}")
+                cursor.execute("BEGIN")
+                cursor.executemany(insert_sql, records)
+                cursor.execute("COMMIT")
+                print(f"  ✅ Partition {partition_id}: {len(records)} records committed")
+                return len(records)
+            except Exception as e:
+                try:
+                    cursor.execute("ROLLBACK")
+                except Exception:
+                    pass
+                if not self._is_queued_error(e) or attempt == max_retries:
+                    raise
+                delay = min(60, 2 ** attempt) * random.uniform(0.5, 1.5)
+                print(f"  ⏳ Partition {partition_id}: warehouse queued ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def load_data_from_csv_parallel(self, csv_file_path, workers=4, max_retries=5, queued_timeout=60,
+                                    staging_table='JOBPOSTINGSSCRAPED_STAGING'):
+        """
+        Upload the CSV over several connections at once
+        
+        Records are split into one partition per worker; each partition is
+        inserted over its own connection in its own transaction. Statements
+        rejected for queueing are retried with jittered exponential backoff.
+        
+        The partitions go to a staging table, whose row count and CONTENT_HASH
+        checksum are compared with what was sent before it is swapped with
+        JOBPOSTINGSSCRAPED, as load_data_from_csv_with_swap does. If a
+        partition fails after its retries, the staging table is dropped and
+        the live table is left untouched.
+        
+        Args:
+            csv_file_path (str): CSV export to load
+            workers (int): Number of concurrent connections
+            max_retries (int): Retries per partition when the warehouse is queued
+            queued_timeout (int): STATEMENT_QUEUED_TIMEOUT_IN_SECONDS for worker sessions
+            staging_table (str): Table the partitions are loaded into before the swap
+        
+        Returns:
+            int: Number of records loaded
+        """
+        try:
+            df = pd.read_csv(csv_file_path, dtype=CSV_DTYPES)
+            print(f"📊 Loaded {len(df)} records from CSV")
+            
+            start_time = time.perf_counter()
+            records = self._build_records(self._prepare_dataframe(df))
+            
+            partition_size = max(1, -(-len(records) // workers))
+            partitions = [records[i:i + partition_size] for i in range(0, len(records), partition_size)]
+            print(f"🚀 Uploading {len(records)} records in {len(partitions)} partitions over {workers} connections")
+            
+            # The swap needs a live table to exchange with, even on the very first load
+            self.create_table()
+            self.cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            self.create_table(staging_table)
+            
+            try:
+                insert_sql = insert_sql_for(staging_table)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(self._upload_partition, i, partition, max_retries, queued_timeout, insert_sql)
+                        for i, partition in enumerate(partitions, 1)
+                    ]
+                    total = sum(future.result() for future in futures)
                 
-                # Handle NaN values in each field
-                def clean_value(val):
-                    if pd.isna(val) or val == 'nan' or val == 'NAN':
-                        return None
-                    return val
+                elapsed = time.perf_counter() - start_time
+                print(f"✅ Successfully loaded {total} records into {staging_table} "
+                      f"(parallel x{workers}: {total / max(elapsed, 1e-9):.0f} rows/s)")
                 
-                record = (
-                    clean_value(row.get('tid', '')),
-                    clean_value(row.get('title', '')),
-                    clean_value(row.get('company', '')),
-                    clean_value(row.get('company_id', '')),
-                    clean_value(row.get('contact_email', '')),
-                    clean_value(row.get('contact_person', '')),
-                    clean_value(row.get('location', '')),
-                    clean_value(row.get('posted_date')),
-                    clean_value(row.get('last_date')),
-                    clean_value(row.get('description', '')),
-                    clean_value(row.get('url', '')),
-                    clean_value(row.get('share_url', '')),
-                    clean_value(row.get('salary', '')),
-                    clean_value(row.get('job_type', '')),
-                    clean_value(row.get('is_archived')),
-                    clean_value(row.get('is_local')),
-                    scraped_at
-                )
-                records.append(record)
+                self.verify_checksum(records, staging_table)
+                self.cursor.execute(f"ALTER TABLE {staging_table} SWAP WITH JOBPOSTINGSSCRAPED")
+                print(f"✅ Swapped {staging_table} into JOBPOSTINGSSCRAPED ({total} records)")
+            finally:
+                # After a swap this holds the previous load; after a failure, the partial one
+                self.cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
             
-            # Insert data
-            insert_sql = """
-            INSERT INTO JOBPOSTINGSSCRAPED (
-                TID, TITLE, COMPANY, COMPANY_ID, CONTACT_EMAIL, CONTACT_PERSON, LOCATION, POSTED_DATE, LAST_DATE,
-                DESCRIPTION, URL, SHARE_URL, SALARY, JOB_TYPE, IS_ARCHIVED, IS_LOCAL, SCRAPED_AT
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+            return total
             
-            self.cursor.executemany(insert_sql, records)
-            self.conn.commit()
+        except Exception as e:
+            print(f"❌ Error loading data in parallel (live table unchanged): {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def verify_checksum(self, records, table_name='JOBPOSTINGSSCRAPED'):
+        """Compare the table's row count and CONTENT_HASH checksum with the records that were sent"""
+        self.cursor.execute(checksum_sql_for(table_name))
+        count, checksum = self.cursor.fetchone()
+        expected_count, expected_checksum = len(records), records_checksum(records)
+        
+        if count != expected_count or int(checksum) != expected_checksum:
+            raise RuntimeError(
+                f"Load verification failed: table has {count} rows (checksum {checksum}), "
+                f"expected {expected_count} rows (checksum {expected_checksum})"
+            )
+        print(f"✅ Verified {count} rows, checksum {checksum}")
+    
+    def load_data_from_csv_with_swap(self, csv_file_path, staging_table='JOBPOSTINGSSCRAPED_STAGING'):
+        """
+        Load into a staging table and atomically swap it with the live table
+        
+        The live JOBPOSTINGSSCRAPED keeps serving the previous load until the
+        staging table has been filled and passed verify_data, then
+        ALTER TABLE ... SWAP WITH exchanges the two in a single metadata
+        operation. On any failure the staging table is dropped and the live
+        table is left untouched.
+        
+        Returns:
+            int: Number of records now in the live table
+        """
+        try:
+            df = pd.read_csv(csv_file_path, dtype=CSV_DTYPES)
+            print(f"📊 Loaded {len(df)} records from CSV")
+            records = self._build_records(self._prepare_dataframe(df))
+            
+            # The swap needs a live table to exchange with, even on the very first load
+            self.create_table()
+            self.cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            self.create_table(staging_table)
+            
+            try:
+                self.cursor.executemany(insert_sql_for(staging_table), records)
+                self.conn.commit()
+                
+                count = self.verify_data(staging_table)
+                if count != len(records):
+                    raise RuntimeError(f"Staging table has {count} rows, expected {len(records)}")
+                
+                self.cursor.execute(f"ALTER TABLE {staging_table} SWAP WITH JOBPOSTINGSSCRAPED")
+                print(f"✅ Swapped {staging_table} into JOBPOSTINGSSCRAPED ({count} records)")
+            finally:
+                # After a swap this holds the previous load; after a failure, the partial one
+                self.cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
             
-            print(f"✅ Successfully loaded {len(records)} records into Snowflake")
+            return count
             
         except Exception as e:
-            print(f"❌ Error loading data: {e}")
+            print(f"❌ Error loading data via staging swap (live table unchanged): {e}")
+            import traceback
+            traceback.print_exc()
+            raise
+    
+    def ensure_content_hash_column(self):
+        """Add the CONTENT_HASH column to tables created before incremental loads existed"""
+        try:
+            self.cursor.execute("ALTER TABLE JOBPOSTINGSSCRAPED ADD COLUMN IF NOT EXISTS CONTENT_HASH VARCHAR(64)")
+        except Exception as e:
+            print(f"❌ Error adding CONTENT_HASH column: {e}")
+            raise
+    
+    def _fetch_existing_state(self):
+        """Return {TID: (CONTENT_HASH, IS_ARCHIVED)} for every posting already in the table"""
+        self.cursor.execute("SELECT TID, CONTENT_HASH, IS_ARCHIVED FROM JOBPOSTINGSSCRAPED WHERE TID IS NOT NULL")
+        return {row[0]: (row[1], row[2]) for row in self.cursor.fetchall()}
+    
+    def load_incremental_from_csv(self, csv_file_path):
+        """
+        Merge the CSV into JOBPOSTINGSSCRAPED without dropping the table
+        
+        Postings are matched on TID and compared by CONTENT_HASH: new TIDs are
+        inserted, changed ones are updated in place and TIDs that are no longer
+        in the export are flagged IS_ARCHIVED. Only the churn is sent to Snowflake.
+        
+        Returns:
+            dict: counts for inserted, updated, archived and unchanged postings
+        """
+        try:
+            df = pd.read_csv(csv_file_path, dtype=CSV_DTYPES)
+            print(f"📊 Loaded {len(df)} records from CSV")
+            
+            df = self._prepare_dataframe(df)
+            
+            # Key the export by TID (last occurrence wins); rows without a TID can't be merged
+            incoming = {}
+            for record in self._build_records(df):
+                if record[0]:
+                    incoming[str(record[0])] = record
+            
+            self.ensure_content_hash_column()
+            existing = self._fetch_existing_state()
+            print(f"📊 Found {len(existing)} postings already in JOBPOSTINGSSCRAPED")
+            
+            new_records = []
+            changed_records = []
+            for tid, record in incoming.items():
+                if tid not in existing:
+                    new_records.append(record)
+                elif existing[tid][0] != record[-1] or (existing[tid][1] and not record[14]):
+                    # Changed content, or a posting we archived that is live again
+                    changed_records.append(record)
+            
+            archived_tids = [
+                tid for tid, (_, is_archived) in existing.items()
+                if tid not in incoming and not is_archived
+            ]
+            
+            # Temporary tables are DDL and would commit an open transaction, so create it first
+            if changed_records:
+                self.cursor.execute("CREATE OR REPLACE TEMPORARY TABLE JOBPOSTINGSSCRAPED_DELTA LIKE JOBPOSTINGSSCRAPED")
+            
+            self.cursor.execute("BEGIN")
+            try:
+                if new_records:
+                    self.cursor.executemany(INSERT_SQL, new_records)
+                
+                if changed_records:
+                    self.cursor.executemany(insert_sql_for('JOBPOSTINGSSCRAPED_DELTA'), changed_records)
+                    assignments = ', '.join(f"{column} = d.{column}" for column in JOB_COLUMNS if column != 'TID')
+                    self.cursor.execute(f"""
+                        UPDATE JOBPOSTINGSSCRAPED t
+                        SET {assignments}, LOADED_AT = CURRENT_TIMESTAMP()
+                        FROM JOBPOSTINGSSCRAPED_DELTA d
+                        WHERE t.TID = d.TID
+                    """)
+                
+                for start in range(0, len(archived_tids), ARCHIVE_BATCH_SIZE):
+                    batch = archived_tids[start:start + ARCHIVE_BATCH_SIZE]
+                    placeholders = ', '.join(['%s'] * len(batch))
+                    self.cursor.execute(
+                        f"UPDATE JOBPOSTINGSSCRAPED SET IS_ARCHIVED = TRUE, LOADED_AT = CURRENT_TIMESTAMP() WHERE TID IN ({placeholders})",
+                        batch
+                    )
+                
+                self.cursor.execute("COMMIT")
+            except Exception:
+                self.cursor.execute("ROLLBACK")
+                raise
+            
+            stats = {
+                'inserted': len(new_records),
+                'updated': len(changed_records),
+                'archived': len(archived_tids),
+                'unchanged': len(incoming) - len(new_records) - len(changed_records)
+            }
+            print(f"✅ Incremental load: {stats['inserted']} inserted, {stats['updated']} updated, "
+                  f"{stats['archived']} archived, {stats['unchanged']} unchanged")
+            return stats
+            
+        except Exception as e:
+            print(f"❌ Error loading incremental data: {e}")
             import traceback
             traceback.print_exc()
             raise
     
-    def verify_data(self):
-        """Verify the data was loaded correctly"""
+    def verify_data(self, table_name='JOBPOSTINGSSCRAPED'):
+        """Verify the data was loaded correctly and return the row count"""
         try:
-            self.cursor.execute("SELECT COUNT(*) FROM JOBPOSTINGSSCRAPED")
+            self.cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
             count = self.cursor.fetchone()[0]
             print(f"📊 Total records in table: {count}")
             
-            self.cursor.execute("""
+            self.cursor.execute(f"""
                 SELECT TITLE, COMPANY, LOCATION, POSTED_DATE 
-                FROM JOBPOSTINGSSCRAPED 
+                FROM {table_name} 
                 ORDER BY POSTED_DATE DESC 
                 LIMIT 5
             """)
@@ -190,6 +820,8 @@ class SnowflakeJobLoader:
             print("\n📋 Sample records:")
             for row in self.cursor.fetchall():
                 print(f"  - {row[0]} at {row[1]} ({row[2]}) - Posted: {row[3]}")
+            
+            return count
                 
         except Exception as e:
             print(f"❌ Error verifying data: {e}")
@@ -201,15 +833,44 @@ class SnowflakeJobLoader:
         self.conn.close()
         print("🔒 Snowflake connection closed")
 
-def main():
-    """Main function to load job data into Snowflake"""
-    print("🚀 Starting Snowflake Job Data Loader...")
+def main(load_mode=None):
+    """
+    Main function to load job data into Snowflake
     
-    # Check if CSV file exists
-    csv_file = "final_jobindex_jobs.csv"
-    if not os.path.exists(csv_file):
-        print(f"❌ CSV file {csv_file} not found!")
-        return
+    Args:
+        load_mode (str): "full" drops and reloads the table, "incremental" merges
+            the delta, "chunked" drops the table and streams the CSV in chunks
+            (JOB_LOAD_CHUNK_SIZE rows, committing every JOB_LOAD_COMMIT_EVERY chunks),
+            "parquet" drops the table and bulk loads it via a staged Parquet file
+            (final_jobindex_jobs.parquet from the scraper when present, else the CSV),
+            "parallel" uploads over JOB_LOAD_WORKERS connections into a staging table
+            and swaps it in once verified,
+            "swap" loads a staging table and atomically swaps it in,
+            "jsonl" drops the table and streams the final jobs of the latest
+            final_jobindex_load-*.jsonl run (or JOB_LOAD_JSONL_PATTERN) in chunks.
+            Defaults to the JOB_LOAD_MODE environment variable, then "full".
+    """
+    load_mode = load_mode or os.getenv('JOB_LOAD_MODE', 'full')
+    print(f"🚀 Starting Snowflake Job Data Loader ({load_mode} mode)...")
+    
+    parquet_file = "final_jobindex_jobs.parquet"
+    if load_mode == "jsonl":
+        # The scraper's final jobs, not the unfiltered final_jobindex_jobs-*.jsonl
+        # stream, which has every parsed posting and no detail-page emails
+        run_id = latest_run_id("final_jobindex_load")
+        jsonl_pattern = os.getenv('JOB_LOAD_JSONL_PATTERN') or (run_id and run_pattern("final_jobindex_load", run_id))
+        if not jsonl_pattern:
+            print("❌ No final_jobindex_load-*.jsonl files found!")
+            return
+    elif load_mode == "parquet" and os.path.exists(parquet_file):
+        # Typed export from the scraper; no CSV needed
+        pass
+    else:
+        # Check if CSV file exists
+        csv_file = "final_jobindex_jobs.csv"
+        if not os.path.exists(csv_file):
+            print(f"❌ CSV file {csv_file} not found!")
+            return
     
     # Initialize loader
     loader = SnowflakeJobLoader()
@@ -218,11 +879,42 @@ def main():
         # Create database and schema
         loader.create_database_and_schema()
         
-        # Recreate table with new column order
-        loader.recreate_table_with_new_order()
-        
-        # Load data
-        loader.load_data_from_csv(csv_file)
+        if load_mode == "incremental":
+            # Merge only new/changed/disappeared postings; the table stays readable
+            loader.create_table()
+            loader.load_incremental_from_csv(csv_file)
+        elif load_mode == "chunked":
+            loader.recreate_table_with_new_order()
+            loader.load_data_from_csv_chunked(
+                csv_file,
+                chunk_size=int(os.getenv('JOB_LOAD_CHUNK_SIZE', '5000')),
+                commit_every=int(os.getenv('JOB_LOAD_COMMIT_EVERY', '1'))
+            )
+        elif load_mode == "jsonl":
+            loader.recreate_table_with_new_order()
+            loader.load_data_from_jsonl(
+                jsonl_pattern,
+                chunk_size=int(os.getenv('JOB_LOAD_CHUNK_SIZE', '5000')),
+                commit_every=int(os.getenv('JOB_LOAD_COMMIT_EVERY', '1'))
+            )
+        elif load_mode == "parquet":
+            loader.recreate_table_with_new_order()
+            if os.path.exists(parquet_file):
+                loader.load_data_from_parquet(parquet_file)
+            else:
+                loader.load_data_from_csv_parquet(csv_file)
+        elif load_mode == "parallel":
+            # Readers keep seeing the previous load unless every partition lands
+            loader.load_data_from_csv_parallel(csv_file, workers=int(os.getenv('JOB_LOAD_WORKERS', '4')))
+        elif load_mode == "swap":
+            # Readers keep seeing the previous load until the verified swap
+            loader.load_data_from_csv_with_swap(csv_file)
+        else:
+            # Recreate table with new column order
+            loader.recreate_table_with_new_order()
+            
+            # Load data
+            loader.load_data_from_csv(csv_file)
         
         # Verify data
         loader.verify_data()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Export Parity Check
+Builds the Snowflake records for the same jobs from the scraper's CSV,
+Parquet and JSONL exports, the way each load mode reads them, and checks
+that every path yields the same records and CONTENT_HASH
+
+Usage: python3 verify_export_parity.py [exports_directory]
+(without a directory, sample jobs with gaps in numeric-looking columns are
+exported to a temporary directory first)
+"""
+
+import os
+import sys
+import tempfile
+
+from final_jobindex_scraper import FinalJobindexScraper
+from job_sink import latest_run_id, run_pattern
+from snowflake_loader import JOB_COLUMNS, SnowflakeJobLoader
+
+
+def sample_jobs():
+    """Jobs whose company_id and salary are numbers on some rows and empty on others"""
+    jobs = []
+    for i in range(20):
+        jobs.append({
+            'tid': f"h{1500000 + i}",
+            'title': f"Data Engineer {i}",
+            'company': f"Firma {i} ApS",
+            'company_id': 4000 + i if i % 3 else '',
+            'location': 'København',
+            'posted_date': '2026-10-01',
+            'last_date': '2026-11-01' if i % 2 else '',
+            'description': 'Vi søger en data engineer',
+            'url': f"https://www.jobindex.dk/jobannonce/h{1500000 + i}",
+            'share_url': '',
+            'salary': '45000' if i % 4 else '',
+            'job_type': 'Fuldtid',
+            'contact_person': '',
+            'contact_email': f"job{i}@firma.dk" if i % 5 else '',
+            'is_archived': i % 7 == 0,
+            'is_local': False,
+            'scraped_at': '2026-10-19T08:00:00',
+        })
+    return jobs
+
+
+def export_sample(directory):
+    """Write sample_jobs() through the scraper's own exporters"""
+    # Only the save_to_* methods are used; they need nothing from __init__ but jobs
+    scraper = FinalJobindexScraper.__new__(FinalJobindexScraper)
+    scraper.jobs = sample_jobs()
+    scraper.save_to_csv(os.path.join(directory, "final_jobindex_jobs.csv"))
+    scraper.save_to_parquet(os.path.join(directory, "final_jobindex_jobs.parquet"))
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        scraper.save_to_jsonl(run_id="parity")
+    finally:
+        os.chdir(cwd)
+
+
+def records_by_path(directory):
+    """{load path: records} for every export present in directory"""
+    # The record builders only need the loader's methods, not a connection
+    loader = SnowflakeJobLoader.__new__(SnowflakeJobLoader)
+    paths = {}
+    csv_path = os.path.join(directory, "final_jobindex_jobs.csv")
+    if os.path.exists(csv_path):
+        paths['csv'] = [r for chunk in loader._iter_record_chunks(csv_path, 7) for r in chunk]
+    parquet_path = os.path.join(directory, "final_jobindex_jobs.parquet")
+    if os.path.exists(parquet_path):
+        paths['parquet'] = [r for chunk in loader._iter_parquet_record_chunks(parquet_path) for r in chunk]
+    run_id = latest_run_id("final_jobindex_load", directory)
+    if run_id:
+        pattern = run_pattern("final_jobindex_load", run_id, directory)
+        paths['jsonl'] = [r for chunk in loader._iter_jsonl_record_chunks(pattern, 7) for r in chunk]
+    return paths
+
+
+def main():
+    """Run the check"""
+    if len(sys.argv) > 1:
+        paths = records_by_path(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            export_sample(directory)
+            paths = records_by_path(directory)
+
+    if len(paths) < 2:
+        print(f"❌ Need at least two exports to compare, found: {', '.join(paths) or 'none'}")
+        return 1
+
+    reference_name, reference = next(iter(paths.items()))
+    failed = False
+    for name, records in paths.items():
+        if name == reference_name:
+            continue
+        if len(records) != len(reference):
+            print(f"❌ {name}: {len(records)} records, {reference_name}: {len(reference)}")
+            failed = True
+            continue
+        # Compare as the hash does, so an int and its string are the same value
+        differing = set()
+        for record, expected in zip(records, reference):
+            for column, value, expected_value in zip(JOB_COLUMNS, record, expected):
+                if ('' if value is None else str(value)) != ('' if expected_value is None else str(expected_value)):
+                    differing.add(column)
+        if differing:
+            print(f"❌ {name} differs from {reference_name} in {', '.join(sorted(differing))}")
+            failed = True
+        else:
+            print(f"✅ {name} matches {reference_name} on all {len(records)} records, CONTENT_HASH included")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Page Cache Check
+Stores a detail page fetched through one search and checks that the same
+posting reached through another search (different jobsearchid and
+jobsearch_position) is served from the cache, while another posting is not
+
+Usage: python3 verify_page_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+from page_cache import PageCache
+
+
+def main():
+    """Run the check"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PageCache(os.path.join(directory, "cache.sqlite"))
+        first_search = "https://www.jobindex.dk/c?t=h1588473&ctx=w&jobsearchid=907942310&jobsearch_position=1"
+        second_search = "https://www.jobindex.dk/c?t=h1588473&ctx=w&jobsearchid=907950117&jobsearch_position=14"
+        other_posting = "https://www.jobindex.dk/c?t=h1588474&ctx=w&jobsearchid=907942310&jobsearch_position=2"
+
+        cache.put(first_search, b"<html>h1588473</html>", etag='"v1"')
+        entry = cache.get(second_search)
+        checks = [
+            ("Same posting through another search is a hit", entry is not None and entry['body'] == b"<html>h1588473</html>"),
+            ("Another posting is a miss", cache.get(other_posting) is None),
+        ]
+        cache.close()
+
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())